@@ -0,0 +1,71 @@
+"""Micro-benchmark: rescoring after one capability toggle, full vs. delta.
+
+Replicates the catalog ``--scale`` times (unique service names), then toggles
+one capability at a time and times a full ``score_state`` + ranking against
+``rescore_capabilities`` + ranking on the previous state.
+
+Usage: python benchmarks/bench_capability_delta.py [--scale 200] [--toggles 200]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+from engine.index import CatalogIndex  # noqa: E402
+from engine.scoring import ScoringMatrix  # noqa: E402
+
+
+def scaled_matrix(catalog, scale):
+    services = tuple(
+        engine.Service.from_dict(copy * len(catalog.services) + service.id,
+                                 {"name": f"{service.name} #{copy}" if copy else service.name,
+                                  "category": service.category, "subcategory": service.subcategory,
+                                  "cost_tier": service.cost_tier, "use_cases": list(service.use_cases),
+                                  "integrates_with": list(service.integrates_with),
+                                  "compliance": list(service.compliance),
+                                  "architectural_importance": service.architectural_importance})
+        for copy in range(scale) for service in catalog.services)
+    index = CatalogIndex(services, dict(catalog.patterns))
+    return ScoringMatrix(services, index, dict(catalog.industries))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full rescoring with capability delta rescoring")
+    parser.add_argument("--scale", type=int, default=200, help="replicate the catalog this many times")
+    parser.add_argument("--toggles", type=int, default=200)
+    args = parser.parse_args()
+
+    matrix = scaled_matrix(engine.get_catalog(), args.scale)
+    capabilities = {cap: False for caps in engine.CAPABILITY_CATEGORIES.values() for cap in caps}
+    requirements = {"use_case": "real-time analytics with machine learning and etl", "industry": "healthcare",
+                    "capabilities": capabilities}
+    context = {"selected_services": []}
+    rng = random.Random(0)
+    toggles = [rng.choice(list(capabilities)) for _ in range(args.toggles)]
+
+    full_seconds = delta_seconds = 0.0
+    state = matrix.score_state(requirements, context)
+    for cap in toggles:
+        capabilities[cap] = not capabilities[cap]
+        started = time.perf_counter()
+        full = matrix.rank_state(matrix.score_state(requirements, context), threshold=10, limit=20)
+        full_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        state = matrix.rescore_capabilities(state, capabilities)
+        delta = matrix.rank_state(state, threshold=10, limit=20)
+        delta_seconds += time.perf_counter() - started
+        assert (full.service_ids == delta.service_ids).all()
+
+    print(f"{matrix.size} services, {args.toggles} single-capability toggles")
+    print(f"full rescoring   {full_seconds / args.toggles * 1000:8.3f} ms/toggle")
+    print(f"delta rescoring  {delta_seconds / args.toggles * 1000:8.3f} ms/toggle")
+    print(f"speedup: {full_seconds / delta_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
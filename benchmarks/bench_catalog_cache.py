@@ -0,0 +1,45 @@
+"""Micro-benchmark: per-call cost of fetching the service catalog.
+
+Compares the previous ``@st.cache_data(ttl=3600)`` wrapper, which unpickles a
+fresh copy of the catalog on every cache hit, with the shared ``get_catalog()``
+object that is handed out by reference. The "before" case runs the original
+``get_comprehensive_azure_services``, which built the catalog as one list
+literal; it is regenerated from ``data/services.json``, which holds the same
+list.
+
+Usage: python benchmarks/bench_catalog_cache.py
+"""
+import json
+import logging
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+logging.disable(logging.WARNING)
+
+import streamlit as st  # noqa: E402
+import engine as app  # noqa: E402
+
+
+def bench(label, func, number=2000):
+    func()  # warm the cache so only hits are measured
+    per_call = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{label:<44} {per_call * 1e6:10.2f} us/call")
+    return per_call
+
+
+def original_catalog_function():
+    """The pre-Catalog ``get_comprehensive_azure_services``: one literal list of service dicts"""
+    with open(app.CATALOG_DATA_DIR / app.CATALOG_FILES["services"], encoding="utf-8") as f:
+        services = json.load(f)["services"]
+    namespace = {}
+    exec(f"def get_comprehensive_azure_services():\n    return {services!r}\n", namespace)
+    return namespace["get_comprehensive_azure_services"]
+
+
+if __name__ == "__main__":
+    cached_list = st.cache_data(ttl=3600)(original_catalog_function())
+    before = bench("st.cache_data catalog list (before)", cached_list)
+    after = bench("shared Catalog via get_catalog() (after)", app.get_catalog)
+    print(f"speedup: {before / after:.1f}x")
@@ -0,0 +1,80 @@
+"""Startup benchmark: time-to-first-render with and without the catalog snapshot.
+
+Each sample runs in a fresh interpreter that has already imported Streamlit,
+like a server worker, and then executes the app script once in bare mode:
+module imports, catalog loading and the first render are all measured cold.
+``--scale N`` replicates the catalog N times (with unique service names) to
+show how both paths grow with catalog size.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--scale 1]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RENDER_ONCE = """
+import logging, runpy, time
+logging.disable(logging.WARNING)
+import streamlit
+started = time.perf_counter()
+runpy.run_path({app_path!r}, run_name="__main__")
+print(time.perf_counter() - started)
+"""
+
+
+def prepare_data_dir(scale):
+    data_dir = tempfile.mkdtemp(prefix="catalog-bench-")
+    for filename in ("services.json", "patterns.json", "industries.json", "aliases.json"):
+        shutil.copy(os.path.join(ROOT, "data", filename), data_dir)
+    if scale > 1:
+        path = os.path.join(data_dir, "services.json")
+        with open(path, encoding="utf-8") as f:
+            document = json.load(f)
+        base = document["services"]
+        document["services"] = base + [dict(service, name=f"{service['name']} #{copy}")
+                                       for copy in range(1, scale) for service in base]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f)
+    subprocess.run([sys.executable, os.path.join(ROOT, "build_snapshot.py"), "--data-dir", data_dir],
+                   check=True, capture_output=True, cwd=ROOT)
+    return data_dir
+
+
+def time_first_render(data_dir, use_snapshot):
+    env = dict(os.environ, AZURE_DECIDER_DATA_DIR=data_dir,
+               AZURE_DECIDER_SNAPSHOT=os.path.join(data_dir, "catalog.snapshot") if use_snapshot else "")
+    script = RENDER_ONCE.format(app_path=os.path.join(ROOT, "Newappv2.py"))
+    result = subprocess.run([sys.executable, "-c", script], env=env, check=True,
+                            capture_output=True, text=True, cwd=ROOT)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure time-to-first-render with and without the snapshot")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--scale", type=int, default=1, help="replicate the catalog this many times")
+    args = parser.parse_args()
+
+    data_dir = prepare_data_dir(args.scale)
+    try:
+        results = {}
+        for label, use_snapshot in (("compile from data files", False), ("precompiled snapshot", True)):
+            samples = [time_first_render(data_dir, use_snapshot) for _ in range(args.runs)]
+            results[label] = statistics.median(samples)
+            print(f"{label:<26} median {results[label] * 1000:8.1f} ms  "
+                  f"(min {min(samples) * 1000:.1f}, max {max(samples) * 1000:.1f}, runs {args.runs})")
+        saved = results["compile from data files"] - results["precompiled snapshot"]
+        print(f"snapshot saves {saved * 1000:.1f} ms per cold start")
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Micro-benchmark: per-request scoring with and without precomputed component tables.
+
+For each catalog size (the catalog replicated ``--scales`` times), scores random
+requirements with ``score_state``, whose industry-dependent columns come from the
+tables built at catalog load, and with the same call plus what every request
+used to pay: the compliance-match and industry-relevance columns recomputed for
+its industry and the totals summed over all seven components.
+
+Usage: python benchmarks/bench_static_components.py [--scales 1 10 50 200] [--requests 50] [--repeats 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+from bench_capability_delta import scaled_matrix  # noqa: E402
+
+CONTEXT = {"selected_services": []}
+
+
+def score_precomputed(matrix, requirements):
+    return matrix.score_state(requirements, CONTEXT).totals
+
+
+def score_recomputed(matrix, requirements):
+    industry = requirements.get("industry", "")
+    components = list(matrix.score_state(requirements, CONTEXT).components)
+    components[2] = matrix._compliance_match(industry)
+    components[5] = matrix._industry_relevance(industry)
+    return np.sum(components, axis=0, dtype=np.int64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request scoring cost with and without precomputed tables")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50, 200])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5, help="report the fastest of this many runs")
+    args = parser.parse_args()
+
+    catalog = engine.get_catalog()
+    capabilities = [cap for caps in engine.CAPABILITY_CATEGORIES.values() for cap in caps]
+    industries = [""] + list(catalog.industries)
+    words = ["analytics", "machine learning", "etl", "web", "iot", "security", "api", "real-time", "storage"]
+
+    print(f"{'services':>9} {'recomputed':>12} {'precomputed':>12} {'saved':>7}")
+    for scale in args.scales:
+        matrix = scaled_matrix(catalog, scale)
+        rng = random.Random(0)
+        requests = [{"use_case": " ".join(rng.sample(words, 3)), "industry": rng.choice(industries),
+                     "capabilities": {cap: rng.random() < 0.2 for cap in capabilities}}
+                    for _ in range(args.requests)]
+        for requirements in requests:
+            assert (score_recomputed(matrix, requirements) == score_precomputed(matrix, requirements)).all()
+        timings = {}
+        for label, score in (("recomputed", score_recomputed), ("precomputed", score_precomputed)):
+            best = float("inf")
+            for _ in range(args.repeats):
+                started = time.perf_counter()
+                for requirements in requests:
+                    score(matrix, requirements)
+                best = min(best, time.perf_counter() - started)
+            timings[label] = best / args.requests * 1000
+        print(f"{matrix.size:>9} {timings['recomputed']:>9.3f} ms {timings['precomputed']:>9.3f} ms "
+              f"{1 - timings['precomputed'] / timings['recomputed']:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
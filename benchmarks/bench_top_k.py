@@ -0,0 +1,68 @@
+"""Micro-benchmark: top-K selection of recommended services.
+
+Replicates the catalog ``--scale`` times, scores random requirements and times
+ranking by a full sort of every service above the threshold against the
+partition-based top-K selection, and reports how many services the synergy
+rounds still have to rank after upper-bound pruning.
+
+Usage: python benchmarks/bench_top_k.py [--scale 200] [--requests 50] [--top-k 20] [--min-score 10]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine  # noqa: E402
+from bench_capability_delta import scaled_matrix  # noqa: E402
+
+
+def full_sort(matrix, totals, threshold, limit):
+    rows = np.flatnonzero(totals > threshold)
+    return rows[np.lexsort((matrix.name_rank[rows], -totals[rows]))[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full sorting with top-K selection")
+    parser.add_argument("--scale", type=int, default=200, help="replicate the catalog this many times")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=engine.TOP_SERVICES_LIMIT)
+    parser.add_argument("--min-score", type=int, default=engine.MIN_SERVICE_SCORE)
+    args = parser.parse_args()
+
+    matrix = scaled_matrix(engine.get_catalog(), args.scale)
+    capabilities = [cap for caps in engine.CAPABILITY_CATEGORIES.values() for cap in caps]
+    words = ["analytics", "machine learning", "etl", "web", "iot", "security", "api", "real-time", "storage"]
+    rng = random.Random(0)
+
+    sort_seconds = top_k_seconds = 0.0
+    candidates = 0
+    for _ in range(args.requests):
+        requirements = {"use_case": " ".join(rng.sample(words, 3)),
+                        "industry": rng.choice(["", "healthcare", "financial", "technology", "manufacturing"]),
+                        "capabilities": {cap: rng.random() < 0.2 for cap in capabilities}}
+        state = matrix.score_state(requirements, {"selected_services": []})
+
+        started = time.perf_counter()
+        expected = full_sort(matrix, state.totals, args.min_score, args.top_k)
+        sort_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        ranked = matrix.rank_state(state, threshold=args.min_score, limit=args.top_k)
+        top_k_seconds += time.perf_counter() - started
+        assert (ranked.service_ids == expected).all()
+        candidates += len(matrix._synergy_candidates(state.totals, args.min_score, args.top_k))
+
+    print(f"{matrix.size} services, {args.requests} requests, top {args.top_k} above {args.min_score}")
+    print(f"full sort        {sort_seconds / args.requests * 1000:8.3f} ms/request")
+    print(f"top-K selection  {top_k_seconds / args.requests * 1000:8.3f} ms/request")
+    print(f"speedup: {sort_seconds / top_k_seconds:.1f}x")
+    print(f"synergy rounds rank {candidates / args.requests / matrix.size:.1%} of services after pruning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Import-time regression check for Newappv2.py.
+
+Runs ``python -X importtime -c "import Newappv2"`` in a fresh interpreter and
+fails when one of the heavy visualization/dataframe modules is imported at
+module load again, when the app's own import cost (excluding Streamlit,
+which every worker has already loaded) exceeds the budget, or when the
+headless ``engine`` package starts pulling in Streamlit.
+
+Usage: python benchmarks/check_import_time.py [--budget-ms 400] [--top 10]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only needed by the Cost Analysis tab; they must stay lazy.
+LAZY_MODULES = ("pandas", "plotly.express", "plotly.graph_objects", "plotly.subplots")
+
+
+def parse_importtime(stderr):
+    """Return [(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(statement):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, cwd=ROOT)
+    if result.returncode != 0:
+        raise SystemExit(result.stderr)
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that Newappv2 stays cheap to import")
+    parser.add_argument("--budget-ms", type=float, default=400.0,
+                        help="maximum import cost of Newappv2 on top of Streamlit")
+    parser.add_argument("--top", type=int, default=10, help="show the N most expensive top-level imports")
+    args = parser.parse_args()
+
+    rows = measure("import streamlit; import Newappv2")
+    app_rows = [row for row in rows if row[0] == "Newappv2"]
+    if not app_rows:
+        raise SystemExit("Newappv2 did not show up in the importtime output")
+    app_us = app_rows[0][2]
+
+    # Top-level imports that happened while Newappv2 was loading are the ones
+    # listed (at depth 1) before its own line and after streamlit's.
+    names = [row[0] for row in rows]
+    start = names.index("streamlit") + 1
+    end = names.index("Newappv2")
+    children = sorted((row for row in rows[start:end] if row[3] == 1), key=lambda row: -row[2])
+    # Streamlit may import some of these itself; only count the ones the app pulls in.
+    loaded = {row[0] for row in rows[start:end]}
+
+    print(f"Newappv2 import: {app_us / 1000:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, _, cumulative_us, _ in children[:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    failures = [f"{module} is imported eagerly" for module in LAZY_MODULES if module in loaded]
+    if any(row[0] == "streamlit" for row in measure("import engine")):
+        failures.append("engine imports streamlit")
+    if app_us / 1000 > args.budget_ms:
+        failures.append(f"import took {app_us / 1000:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Load test for the local HTTP API (serve_api.py).
+
+Opens ``--connections`` keep-alive connections and sends ``--requests`` POSTs
+spread over them, cycling through ``--distinct`` random requirement profiles
+so the response cache hit rate can be varied. Reports throughput and latency
+percentiles. Start the server first, e.g. ``python serve_api.py``.
+
+Usage: python benchmarks/load_test_api.py [--url http://127.0.0.1:8600/score]
+       [--requests 5000] [--connections 32] [--distinct 200]
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from urllib.parse import urlsplit
+
+CAPABILITIES = ["Data Warehousing", "Real-time Analytics", "Machine Learning", "Generative AI", "Web Applications",
+                "APIs", "Microservices", "Serverless", "Containers", "Monitoring", "Security", "IoT"]
+WORDS = ["analytics", "machine learning", "etl", "web", "iot", "security", "api", "real-time", "storage"]
+
+
+def profiles(count):
+    rng = random.Random(0)
+    return [{"use_case": " ".join(rng.sample(WORDS, 3)),
+             "industry": rng.choice(["", "healthcare", "financial", "retail", "manufacturing"]),
+             "capabilities": {cap: True for cap in rng.sample(CAPABILITIES, 3)},
+             "team_size": rng.choice([5, 10, 25]), "expected_users": rng.choice([1000, 10000])}
+            for _ in range(count)]
+
+
+async def connection(host, port, path, bodies, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while bodies:
+            body = bodies.pop()
+            started = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    encoded = [json.dumps(profile).encode() for profile in profiles(args.distinct)]
+    bodies = [encoded[i % len(encoded)] for i in range(args.requests)]
+    random.Random(1).shuffle(bodies)
+    latencies, errors = [], []
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(url.hostname, url.port or 80, url.path, bodies, latencies, errors)
+                           for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    percentile = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000  # noqa: E731
+    print(f"{len(latencies)} requests to {args.url} over {args.connections} connections "
+          f"({args.distinct} distinct profiles), {len(errors)} errors")
+    print(f"throughput {len(latencies) / elapsed:8.1f} requests/s")
+    print(f"latency    p50 {percentile(0.5):.1f} ms  p95 {percentile(0.95):.1f} ms  p99 {percentile(0.99):.1f} ms  "
+          f"mean {statistics.mean(latencies) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the local recommendation API")
+    parser.add_argument("--url", default="http://127.0.0.1:8600/score")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--distinct", type=int, default=200, help="distinct requirement profiles to cycle through")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
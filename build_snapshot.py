@@ -0,0 +1,37 @@
+"""Build the precompiled catalog snapshot that app workers load at startup.
+
+Compiles the data files into a Catalog (records, index, keyword automaton and
+scoring matrices) and writes it to a single memory-mappable file. Workers fall
+back to compiling from the data files whenever the snapshot is missing or was
+built from different data.
+
+Usage: python build_snapshot.py [--data-dir data] [--output data/catalog.snapshot]
+"""
+import argparse
+import time
+
+import engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default=str(engine.CATALOG_DATA_DIR), help="directory with the catalog data files")
+    parser.add_argument("--output", default=None, help="snapshot path (default: <data-dir>/catalog.snapshot)")
+    args = parser.parse_args()
+    output = args.output or f"{args.data_dir}/catalog.snapshot"
+
+    started = time.perf_counter()
+    store = engine.CatalogStore(args.data_dir, snapshot_path="")
+    store.snapshot(output)
+    catalog = store.current()
+    print(f"Wrote {output}: catalog {catalog.version}, {len(catalog.services)} services, "
+          f"{len(catalog.patterns)} patterns in {time.perf_counter() - started:.3f}s")
+    unresolved = catalog.unresolved_references()
+    if unresolved:
+        print(f"{len(unresolved)} service references match no catalog service or alias (see data/aliases.json):")
+        for name, locations in unresolved.items():
+            print(f"  {name}: {', '.join(locations)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Headless Azure architecture recommendation engine.
+
+Everything here runs without Streamlit, so batch jobs, tests and API servers
+can call ``analyze(requirements)`` directly. The Streamlit app in Newappv2.py
+is a thin client of this package.
+"""
+from .analysis import (calculate_business_value, detect_architecture_patterns, generate_architecture_diagram,
+                       generate_cost_analysis, validate_architecture_completeness)
+from .cache import ResultCache, canonical_requirements, requirements_key
+from .catalog import CATALOG_DATA_DIR, CATALOG_FILES, Catalog, CatalogValidationError
+from .pipeline import (ANALYSIS_STAGES, STAGE_DEPENDENCIES, AnalysisResult, analyze, result_cache, scoring_cache,
+                       validate_requirements)
+from .records import Service
+from .scoring import (CAPABILITY_CATEGORIES, MIN_SERVICE_SCORE, SCORE_COMPONENTS, TOP_SERVICES_LIMIT, ScoredServices,
+                      calculate_comprehensive_score)
+from .store import CatalogStore, get_catalog, get_catalog_store
+
+__all__ = [
+    "ANALYSIS_STAGES",
+    "AnalysisResult",
+    "CAPABILITY_CATEGORIES",
+    "CATALOG_DATA_DIR",
+    "CATALOG_FILES",
+    "Catalog",
+    "CatalogStore",
+    "CatalogValidationError",
+    "MIN_SERVICE_SCORE",
+    "ResultCache",
+    "SCORE_COMPONENTS",
+    "STAGE_DEPENDENCIES",
+    "ScoredServices",
+    "Service",
+    "TOP_SERVICES_LIMIT",
+    "analyze",
+    "calculate_business_value",
+    "calculate_comprehensive_score",
+    "canonical_requirements",
+    "detect_architecture_patterns",
+    "generate_architecture_diagram",
+    "generate_cost_analysis",
+    "get_catalog",
+    "get_catalog_store",
+    "requirements_key",
+    "result_cache",
+    "scoring_cache",
+    "validate_architecture_completeness",
+    "validate_requirements",
+]
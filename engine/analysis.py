@@ -0,0 +1,345 @@
+"""Pattern detection, cost analysis, validation, diagrams and business value"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .catalog import Catalog
+from .records import Service
+
+def detect_architecture_patterns(selected_services: List[Service], requirements: Dict, catalog: Catalog) -> List[Dict]:
+    """Enhanced pattern detection with completeness analysis"""
+    detected_patterns = []
+    index = catalog.index
+    
+    use_case_text = requirements.get("use_case", "")
+    capabilities = requirements.get("capabilities", {})
+    selected_caps = "\n".join(cap for cap, selected in capabilities.items() if selected)
+    aligned_use_cases = index.matched_terms(use_case_text) | index.matched_terms(selected_caps)
+    
+    selected_ids = [svc.id for svc in selected_services]
+    selected_mask = index.selection_mask(selected_ids)
+    
+    # Patterns sharing neither a service nor a use case would be "minimal" with no alignment
+    for pattern_name in index.candidate_patterns(selected_ids, aligned_use_cases):
+        pattern = catalog.patterns[pattern_name]
+        masks = index.pattern_masks[pattern_name]
+        
+        # Calculate coverage
+        required_coverage = (masks.required & selected_mask).bit_count()
+        recommended_coverage = (masks.recommended & selected_mask).bit_count()
+        optional_coverage = (masks.optional & selected_mask).bit_count()
+        
+        total_required = len(masks.required_ids)
+        total_recommended = len(masks.recommended_ids)
+        
+        # Determine completeness
+        if required_coverage == total_required:
+            if recommended_coverage >= total_recommended * 0.7:
+                completeness = "complete"
+            else:
+                completeness = "core_complete"
+        elif required_coverage >= total_required * 0.8:
+            completeness = "mostly_complete"
+        elif required_coverage >= total_required * 0.5:
+            completeness = "partially_complete"
+        else:
+            completeness = "minimal"
+        
+        # Check use case alignment
+        pattern_use_cases = pattern["use_cases"]
+        use_case_alignment = sum(1 for uc in pattern_use_cases if uc in aligned_use_cases)
+        
+        # Only include patterns with some relevance
+        if completeness != "minimal" or use_case_alignment > 0:
+            pattern_score = (required_coverage * 3 + recommended_coverage * 2 + 
+                           optional_coverage + use_case_alignment * 2)
+            
+            detected_patterns.append({
+                "name": pattern["name"],
+                "description": pattern["description"],
+                "completeness": completeness,
+                "required_coverage": f"{required_coverage}/{total_required}",
+                "recommended_coverage": f"{recommended_coverage}/{total_recommended}",
+                "optional_coverage": optional_coverage,
+                "missing_required": index.names_in_mask(masks.required & ~selected_mask, masks.required_ids),
+                "missing_recommended": index.names_in_mask(masks.recommended & ~selected_mask, masks.recommended_ids),
+                "pattern_score": pattern_score,
+                "complexity": pattern["complexity"],
+                "timeline": pattern["estimated_timeline"],
+                "use_case_alignment": use_case_alignment
+            })
+    
+    # Sort by pattern score
+    detected_patterns.sort(key=lambda x: x["pattern_score"], reverse=True)
+    return detected_patterns
+
+def generate_cost_analysis(selected_services: List[Service], requirements: Dict) -> Dict:
+    """Enhanced cost analysis with detailed breakdown and optimization suggestions"""
+    
+    # Base cost estimates (monthly USD)
+    base_costs = {
+        "free": 0,
+        "low": 75,
+        "medium": 350,
+        "high": 1200,
+        "variable": 200
+    }
+    
+    # Scaling factors based on requirements
+    team_size = requirements.get("team_size", 10)
+    data_volume = requirements.get("data_volume_gb", 500)
+    expected_users = requirements.get("expected_users", 1000)
+    
+    cost_analysis = {
+        "services": {},
+        "category_totals": {},
+        "scaling_assumptions": {
+            "team_size": team_size,
+            "data_volume_gb": data_volume,
+            "expected_users": expected_users
+        }
+    }
+    
+    total_monthly = 0
+    category_costs = {}
+    
+    for service in selected_services:
+        cost_tier = service.cost_tier
+        category = service.category
+        base_cost = base_costs[cost_tier]
+        
+        # Apply scaling based on service type
+        if "Analytics" in category or "AI" in category:
+            scaling_factor = max(1, data_volume / 100)
+        elif "Compute" in category or "Container" in category:
+            scaling_factor = max(1, expected_users / 500)
+        elif "Database" in category:
+            scaling_factor = max(1, (data_volume / 200) * (expected_users / 1000))
+        elif "DevOps" in category:
+            scaling_factor = max(1, team_size / 5)
+        else:
+            scaling_factor = max(1, expected_users / 1000)
+        
+        monthly_cost = base_cost * scaling_factor
+        annual_cost = monthly_cost * 12 * 0.85  # Assume 15% annual discount
+        
+        cost_analysis["services"][service.name] = {
+            "monthly_estimate": round(monthly_cost, 2),
+            "annual_estimate": round(annual_cost, 2),
+            "cost_tier": cost_tier,
+            "scaling_factor": round(scaling_factor, 2),
+            "category": category
+        }
+        
+        total_monthly += monthly_cost
+        category_costs[category] = category_costs.get(category, 0) + monthly_cost
+    
+    cost_analysis["total_monthly"] = round(total_monthly, 2)
+    cost_analysis["total_annual"] = round(total_monthly * 12 * 0.85, 2)
+    cost_analysis["category_totals"] = {k: round(v, 2) for k, v in category_costs.items()}
+    
+    # Cost optimization suggestions
+    optimization_suggestions = []
+    
+    high_cost_services = [name for name, details in cost_analysis["services"].items() 
+                         if details["monthly_estimate"] > 500]
+    
+    if high_cost_services:
+        optimization_suggestions.append(
+            f"Consider reserved instances for high-cost services: {', '.join(high_cost_services[:3])}"
+        )
+    
+    if cost_analysis["total_monthly"] > 2000:
+        optimization_suggestions.append(
+            "Explore Azure Hybrid Benefit for Windows and SQL Server licensing savings"
+        )
+    
+    serverless_alternatives = ["Azure Functions", "Azure Container Apps", "Azure Logic Apps"]
+    compute_services = [name for name, details in cost_analysis["services"].items() 
+                       if "Compute" in details["category"]]
+    
+    if compute_services and not any(alt in cost_analysis["services"] for alt in serverless_alternatives):
+        optimization_suggestions.append(
+            "Consider serverless alternatives for variable workloads to optimize costs"
+        )
+    
+    cost_analysis["optimization_suggestions"] = optimization_suggestions
+    
+    return cost_analysis
+
+def generate_architecture_diagram(selected_services: List[Service], patterns: List[Dict]) -> str:
+    """Generate comprehensive Mermaid architecture diagram"""
+    
+    # Group services by category
+    service_groups = {}
+    for service in selected_services:
+        category = service.category
+        if category not in service_groups:
+            service_groups[category] = []
+        service_groups[category].append(service.name)
+    
+    # Define flow relationships
+    flow_relationships = {
+        "Integration & Messaging": ["Compute", "Analytics & BI", "AI & Machine Learning"],
+        "IoT & Edge": ["Analytics & BI", "Storage", "AI & Machine Learning"],
+        "Compute": ["Databases", "Storage", "AI & Machine Learning"],
+        "Containers": ["Databases", "Storage", "Networking"],
+        "Analytics & BI": ["Storage", "Databases"],
+        "AI & Machine Learning": ["Storage", "Analytics & BI"],
+        "DevOps & Developer Tools": ["Compute", "Containers"],
+        "Networking": ["Security & Identity"],
+        "Security & Identity": ["Monitoring & Management"]
+    }
+    
+    # Build Mermaid diagram
+    diagram = ["flowchart TB"]
+    
+    # Create subgraphs for each category
+    node_counter = 0
+    category_nodes = {}
+    
+    for category, services in service_groups.items():
+        safe_category = category.replace(" ", "_").replace("&", "and")
+        diagram.append(f"    subgraph {safe_category} [\"{category}\"]")
+        category_nodes[category] = []
+        
+        for service in services:
+            node_id = f"node{node_counter}"
+            # Shorten service names for better display
+            display_name = service.replace("Azure ", "").replace("Microsoft ", "")
+            if len(display_name) > 25:
+                display_name = display_name[:22] + "..."
+            
+            diagram.append(f"        {node_id}[\"{display_name}\"]")
+            category_nodes[category].append(node_id)
+            node_counter += 1
+        
+        diagram.append("    end")
+    
+    # Add relationships between categories
+    for source_category, target_categories in flow_relationships.items():
+        if source_category in service_groups:
+            for target_category in target_categories:
+                if target_category in service_groups:
+                    # Connect first node of source to first node of target
+                    if (category_nodes.get(source_category) and 
+                        category_nodes.get(target_category)):
+                        source_node = category_nodes[source_category][0]
+                        target_node = category_nodes[target_category][0]
+                        diagram.append(f"    {source_node} --> {target_node}")
+    
+    # Add styling
+    diagram.extend([
+        "    classDef compute fill:#e1f5fe",
+        "    classDef storage fill:#f3e5f5",
+        "    classDef analytics fill:#e8f5e8",
+        "    classDef security fill:#ffebee",
+        "    classDef ai fill:#fff3e0"
+    ])
+    
+    return "\n".join(diagram)
+
+def validate_architecture_completeness(selected_services: List[Service], requirements: Dict,
+                                       catalog: Catalog) -> Tuple[List[str], List[str], List[str]]:
+    """Comprehensive architecture validation"""
+    
+    categories = [svc.category for svc in selected_services]
+    industry = requirements.get("industry", "")
+    index = catalog.index
+    selected_ids = {svc.id for svc in selected_services}
+    selected_rows = np.array(sorted(selected_ids), dtype=np.int32)
+    
+    critical_gaps = []
+    warnings = []
+    recommendations = []
+    
+    # Essential architecture components
+    if "Security & Identity" not in categories:
+        critical_gaps.append("❌ No identity and security services - Critical security risk")
+        recommendations.append("Add Azure Active Directory and Azure Key Vault for basic security")
+    
+    if "Monitoring & Management" not in categories:
+        critical_gaps.append("❌ No monitoring solution - Cannot observe system health")
+        recommendations.append("Add Azure Monitor and Application Insights for observability")
+    
+    # Data architecture validation
+    has_storage = any("Storage" in cat or "Database" in cat for cat in categories)
+    has_analytics = "Analytics & BI" in categories
+    
+    if has_analytics and not has_storage:
+        warnings.append("⚠️ Analytics services without adequate storage layer")
+        recommendations.append("Consider Azure Data Lake Storage for analytics workloads")
+    
+    # Networking validation
+    has_compute = any(cat in ["Compute", "Containers"] for cat in categories)
+    has_networking = "Networking" in categories
+    
+    if has_compute and not has_networking:
+        warnings.append("⚠️ Compute services without network isolation")
+        recommendations.append("Add Azure Virtual Network for security isolation")
+    
+    # High availability validation
+    critical_services = [svc for svc in selected_services 
+                        if svc.architectural_importance == "critical"]
+    
+    has_load_balancer = np.isin(index.services_with_use_case("load_balancer"), selected_rows).any()
+    if len(critical_services) > 2 and not has_load_balancer:
+        warnings.append("⚠️ No load balancing for high availability")
+        recommendations.append("Consider Azure Load Balancer or Application Gateway")
+    
+    # Industry-specific validation
+    industries = catalog.industries
+    if industry in industries:
+        industry_reqs = industries[industry]
+        missing_required = [svc for svc in industry_reqs["required_services"] 
+                           if index.resolver.resolve(svc) not in selected_ids]
+        
+        if missing_required:
+            critical_gaps.append(f"❌ Missing required {industry} services: {', '.join(missing_required)}")
+    
+    # DevOps validation
+    has_devops = "DevOps & Developer Tools" in categories
+    if has_compute and not has_devops:
+        recommendations.append("Consider adding CI/CD tools like Azure DevOps or GitHub Actions")
+    
+    # Cost optimization suggestions
+    high_cost_services = np.intersect1d(index.services_in_cost_tier("high"), selected_rows)
+    if len(high_cost_services) > 3:
+        warnings.append("⚠️ High number of expensive services - Review cost optimization")
+        recommendations.append("Consider serverless alternatives for variable workloads")
+    
+    return critical_gaps, warnings, recommendations
+
+def calculate_business_value(selected_services: List[Service], requirements: Dict) -> Dict:
+    """Calculate potential ROI and business benefits"""
+    
+    # Count services by category for benefit calculations
+    ai_ml_services = len([s for s in selected_services if "AI" in s.category])
+    analytics_services = len([s for s in selected_services if "Analytics" in s.category])
+    devops_services = len([s for s in selected_services if "DevOps" in s.category])
+    security_services = len([s for s in selected_services if "Security" in s.category])
+    
+    benefits = {
+        "cost_savings": {
+            "infrastructure_reduction": min(0.4, 0.1 + len(selected_services) * 0.02),
+            "operational_efficiency": min(0.3, 0.1 + devops_services * 0.05),
+            "license_optimization": min(0.25, 0.1 + len(selected_services) * 0.01)
+        },
+        "productivity_gains": {
+            "developer_productivity": min(0.5, 0.2 + devops_services * 0.1),
+            "deployment_speed": min(0.7, 0.3 + devops_services * 0.15),
+            "time_to_market": min(0.5, 0.2 + ai_ml_services * 0.1)
+        },
+        "innovation_enablers": {
+            "ai_ml_capabilities": ai_ml_services,
+            "analytics_maturity": analytics_services,
+            "security_posture": security_services
+        },
+        "risk_mitigation": {
+            "security_incidents": min(0.8, security_services * 0.2),
+            "compliance_violations": min(0.9, security_services * 0.25),
+            "downtime_reduction": min(0.6, len([s for s in selected_services if "Monitor" in s.name]) * 0.3)
+        }
+    }
+    
+    return benefits
@@ -0,0 +1,109 @@
+"""Canonical requirement keys and the process-wide analysis cache"""
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .scoring import CAPABILITY_CATEGORIES, MIN_SERVICE_SCORE, TOP_SERVICES_LIMIT, ScoringMatrix
+
+# Distinct analyses kept per process; each one holds at most a few hundred small records
+RESULT_CACHE_SIZE = 256
+
+# One bit per sidebar capability for scoring keys
+_CAPABILITY_BITS = {cap: 1 << bit for bit, cap in enumerate(
+    cap for caps in CAPABILITY_CATEGORIES.values() for cap in caps)}
+
+def canonical_requirements(requirements: Dict) -> Dict:
+    """Requirements reduced to what the analysis depends on.
+
+    Unselected capabilities are dropped and selected ones sorted, so the same
+    configuration always produces the same key regardless of dict order.
+    """
+    return {
+        "use_case": requirements.get("use_case", ""),
+        "industry": requirements.get("industry", ""),
+        "capabilities": sorted(cap for cap, selected in requirements.get("capabilities", {}).items() if selected),
+        "team_size": requirements.get("team_size", 10),
+        "expected_users": requirements.get("expected_users", 1000),
+        "data_volume_gb": requirements.get("data_volume_gb", 500),
+        "top_k": requirements.get("top_k", TOP_SERVICES_LIMIT),
+        "min_score": requirements.get("min_score", MIN_SERVICE_SCORE)
+    }
+
+def requirements_key(requirements: Dict) -> str:
+    """Stable hash of the canonical requirements"""
+    canonical = json.dumps(canonical_requirements(requirements), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+def scoring_key(requirements: Mapping, scoring_matrix: ScoringMatrix) -> Tuple:
+    """Everything scoring reads from the requirements, normalized.
+
+    The use case only counts through the catalog use cases it mentions, so
+    text differing in case, whitespace or wording that matches the same use
+    cases shares a key; capabilities count as a bitset of the selected ones,
+    and an industry without scoring rules scores like no industry. Team size,
+    expected users and data volume are left out: scoring never reads them.
+    """
+    selected = {cap for cap, on in requirements.get("capabilities", {}).items() if on}
+    capability_bits = sum(_CAPABILITY_BITS.get(cap, 0) for cap in selected)
+    other_capabilities = frozenset(cap for cap in selected if cap not in _CAPABILITY_BITS)
+    use_cases = frozenset(scoring_matrix.index.matched_use_cases(requirements.get("use_case", "").lower()))
+    industry = requirements.get("industry", "")
+    if industry not in scoring_matrix.industry_tables:
+        industry = ""
+    return (use_cases, industry, capability_bits, other_capabilities,
+            requirements.get("top_k", TOP_SERVICES_LIMIT), requirements.get("min_score", MIN_SERVICE_SCORE))
+
+class ResultCache:
+    """Thread-safe bounded LRU mapping keys to immutable analysis results.
+
+    With a ``ttl``, entries older than ``ttl`` seconds are dropped on access.
+    ``evictions`` counts entries dropped for either reason.
+    """
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value, stored = self._entries.get(key, (None, 0.0))
+            if value is not None and self.ttl is not None and time.monotonic() - stored > self.ttl:
+                del self._entries[key]
+                self.evictions += 1
+                value = None
+            if value is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,156 @@
+"""Catalog data files, validation and the shared Catalog object"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Tuple
+
+from .index import CatalogIndex
+from .records import Service
+from .resolver import normalize_service_name, unresolved_references
+from .scoring import COST_TIER_SCORES, IMPORTANCE_SCORES, ScoringMatrix
+
+# Catalog data files: the service catalog, architecture patterns, industry
+# requirements and service name aliases are versioned JSON documents that are
+# validated on load and hot-reloaded when they change on disk.
+CATALOG_DATA_DIR = Path(os.environ.get("AZURE_DECIDER_DATA_DIR", Path(__file__).resolve().parent.parent / "data"))
+CATALOG_FILES = {"services": "services.json", "patterns": "patterns.json", "industries": "industries.json",
+                 "aliases": "aliases.json"}
+CATALOG_SCHEMA_VERSION = 1
+RELOAD_CHECK_SECONDS = 2.0
+# Precompiled snapshot of the catalog and its derived structures (see build_snapshot.py);
+# set AZURE_DECIDER_SNAPSHOT to an empty string to always compile from the data files.
+CATALOG_SNAPSHOT_PATH = os.environ.get("AZURE_DECIDER_SNAPSHOT", str(CATALOG_DATA_DIR / "catalog.snapshot"))
+
+SERVICE_SCHEMA = {
+    "name": str, "category": str, "subcategory": str, "cost_tier": str, "use_cases": list,
+    "integrates_with": list, "compliance": list, "description": str, "data_role": str,
+    "architectural_importance": str, "pricing_model": str, "docs": str, "pricing": str
+}
+PATTERN_SCHEMA = {
+    "name": str, "description": str, "required_services": list, "recommended_services": list,
+    "optional_services": list, "use_cases": list, "industries": list, "complexity": str,
+    "estimated_timeline": str
+}
+INDUSTRY_SCHEMA = {
+    "name": str, "compliance_frameworks": list, "required_services": list, "data_residency": str,
+    "encryption": str, "audit_logging": str, "special_considerations": list
+}
+
+class CatalogValidationError(ValueError):
+    """Raised when a catalog data file does not match its schema"""
+
+def _schema_errors(record: Any, schema: Dict[str, type], where: str) -> List[str]:
+    if not isinstance(record, dict):
+        return [f"{where}: expected an object"]
+    errors = []
+    for field, expected in schema.items():
+        if field not in record:
+            errors.append(f"{where}: missing '{field}'")
+        elif not isinstance(record[field], expected):
+            errors.append(f"{where}: '{field}' must be a {expected.__name__}")
+        elif expected is list and not all(isinstance(item, str) for item in record[field]):
+            errors.append(f"{where}: '{field}' must only contain strings")
+    return errors
+
+def validate_catalog_data(services: List[Dict], patterns: Dict[str, Dict], industries: Dict[str, Dict],
+                          aliases: Dict[str, List[str]]) -> None:
+    """Check catalog documents against the schemas, raising CatalogValidationError"""
+    errors = []
+    if (not isinstance(services, list) or not isinstance(patterns, dict) or not isinstance(industries, dict)
+            or not isinstance(aliases, dict)):
+        raise CatalogValidationError("services must be a list; patterns, industries and aliases must be objects")
+    
+    # Normalized name -> the service it names, so aliases cannot make a reference ambiguous
+    seen_names = {}
+    for position, service in enumerate(services):
+        where = f"services[{position}]"
+        service_errors = _schema_errors(service, SERVICE_SCHEMA, where)
+        errors.extend(service_errors)
+        if service_errors:
+            continue
+        if service["cost_tier"] not in COST_TIER_SCORES:
+            errors.append(f"{where}: unknown cost_tier '{service['cost_tier']}'")
+        if service["architectural_importance"] not in IMPORTANCE_SCORES:
+            errors.append(f"{where}: unknown architectural_importance '{service['architectural_importance']}'")
+        name = normalize_service_name(service["name"])
+        if name in seen_names:
+            errors.append(f"{where}: duplicate service name '{service['name']}'")
+        seen_names[name] = service["name"]
+    
+    for key, pattern in patterns.items():
+        errors.extend(_schema_errors(pattern, PATTERN_SCHEMA, f"patterns.{key}"))
+    for key, industry in industries.items():
+        errors.extend(_schema_errors(industry, INDUSTRY_SCHEMA, f"industries.{key}"))
+    for service_name, alternatives in aliases.items():
+        where = f"aliases.{service_name}"
+        canonical = seen_names.get(normalize_service_name(service_name))
+        if canonical is None:
+            errors.append(f"{where}: not a catalog service")
+            continue
+        if not isinstance(alternatives, list) or not all(isinstance(alias, str) for alias in alternatives):
+            errors.append(f"{where}: must be a list of strings")
+            continue
+        for alias in alternatives:
+            named = seen_names.setdefault(normalize_service_name(alias), canonical)
+            if named != canonical:
+                errors.append(f"{where}: alias '{alias}' already names '{named}'")
+    
+    if errors:
+        raise CatalogValidationError("; ".join(errors))
+
+def parse_catalog_file(raw: bytes, part: str) -> Any:
+    """Decode one versioned catalog document and return its payload"""
+    document = json.loads(raw)
+    if not isinstance(document, dict) or document.get("schema_version") != CATALOG_SCHEMA_VERSION:
+        raise CatalogValidationError(f"{part}: unsupported schema_version (expected {CATALOG_SCHEMA_VERSION})")
+    if part not in document:
+        raise CatalogValidationError(f"{part}: missing '{part}' section")
+    return document[part]
+
+class Catalog:
+    """Process-wide, read-only catalog with every structure derived from it.
+
+    One instance is shared by all sessions and handed out by reference, so a
+    session never pays for copying or deserializing the catalog. Treat every
+    attribute as immutable.
+    """
+
+    __slots__ = ("version", "services", "patterns", "industries", "index", "scoring_matrix")
+
+    def __init__(self, version: str, services: Tuple[Service, ...], patterns: Dict, industries: Dict,
+                 index: CatalogIndex, scoring_matrix: ScoringMatrix):
+        self.version = version
+        self.services = services
+        self.patterns = MappingProxyType(patterns)
+        self.industries = MappingProxyType(industries)
+        self.index = index
+        self.scoring_matrix = scoring_matrix
+
+    def __reduce__(self):
+        return (Catalog, (self.version, self.services, dict(self.patterns), dict(self.industries),
+                          self.index, self.scoring_matrix))
+
+    @classmethod
+    def build(cls, data: Dict[str, Any], version: str, previous: "Catalog" = None, 
+              changed: frozenset = frozenset(CATALOG_FILES)) -> "Catalog":
+        """Build from parsed data files, reusing whatever the changed files do not affect"""
+        patterns, industries = data["patterns"], data["industries"]
+        if previous is None or "services" in changed or "aliases" in changed:
+            services = tuple(Service.from_dict(service_id, raw) for service_id, raw in enumerate(data["services"]))
+            index = CatalogIndex(services, patterns, data["aliases"])
+            scoring_matrix = ScoringMatrix(services, index, industries)
+        else:
+            services = previous.services
+            index = previous.index.with_patterns(patterns) if "patterns" in changed else previous.index
+            scoring_matrix = previous.scoring_matrix.rebind(index, industries)
+        return cls(version, services, patterns, industries, index, scoring_matrix)
+
+    def unresolved_references(self) -> Dict[str, List[str]]:
+        """Service names used by the data files that match no catalog service or alias"""
+        return unresolved_references(self.index.resolver, self.services, self.patterns, self.industries)
+
+def catalog_version(digests: Dict[str, str]) -> str:
+    """Catalog content version derived from the data file hashes"""
+    return hashlib.sha256("".join(digests[part] for part in CATALOG_FILES).encode()).hexdigest()[:16]
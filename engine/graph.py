@@ -0,0 +1,43 @@
+"""Integration graph between catalog services"""
+from typing import Tuple
+
+import numpy as np
+
+from .records import Service
+from .resolver import ServiceResolver
+
+def _csr(sources: np.ndarray, targets: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((targets, sources))
+    indptr = np.zeros(size + 1, dtype=np.int32)
+    np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+    return indptr, targets[order].astype(np.int32)
+
+class IntegrationGraph:
+    """Directed "integrates with" edges between catalog services, in CSR form.
+
+    Service ``i`` has an edge to ``j`` when one of ``i``'s integration partners
+    resolves to ``j`` by name or alias ("Synapse" -> "Azure Synapse Analytics").
+    Edges are resolved once at catalog build, so scoring never compares
+    partner names again.
+    """
+
+    def __init__(self, services: Tuple[Service, ...], resolver: ServiceResolver):
+        self.size = len(services)
+        partner_ids = [np.array(sorted(set(resolver.resolve_all(service.integrates_with)) - {service.id}),
+                                dtype=np.int32) for service in services]
+        sources = np.repeat(np.arange(self.size, dtype=np.int32), [len(ids) for ids in partner_ids])
+        targets = np.concatenate(partner_ids) if partner_ids else np.empty(0, dtype=np.int32)
+        self.edge_count = len(targets)
+        self.indptr, self.partners = _csr(sources, targets, self.size)
+        self.reverse_indptr, self.integrators = _csr(targets, sources, self.size)
+
+    def partners_of(self, service_id: int) -> np.ndarray:
+        """Services that ``service_id`` integrates with"""
+        return self.partners[self.indptr[service_id]:self.indptr[service_id + 1]]
+
+    def integrators_of(self, service_ids: np.ndarray) -> np.ndarray:
+        """Services with an edge to any of ``service_ids``, once per edge"""
+        if not len(service_ids):
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([self.integrators[self.reverse_indptr[service_id]:self.reverse_indptr[service_id + 1]]
+                               for service_id in service_ids])
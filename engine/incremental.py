@@ -0,0 +1,82 @@
+"""Stage memoization keyed by the requirement fields each stage actually reads"""
+import json
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterator, Set, Tuple
+
+from .cache import ResultCache, canonical_requirements
+
+# Stage outputs kept per process, across all stages and catalog versions
+STAGE_MEMO_SIZE = 1024
+
+class TrackedRequirements(Mapping):
+    """Read-only view of a requirements dict that records which fields were read"""
+
+    def __init__(self, requirements: Dict):
+        self._requirements = requirements
+        self.reads: Set[str] = set()
+
+    def __getitem__(self, field: str) -> Any:
+        # Recorded before the lookup so that reading a missing field counts too
+        self.reads.add(field)
+        return self._requirements[field]
+
+    def __iter__(self) -> Iterator[str]:
+        self.reads.update(self._requirements)
+        return iter(self._requirements)
+
+    def __len__(self) -> int:
+        return len(self._requirements)
+
+def _field_values(requirements: Dict, fields: FrozenSet[str]) -> Tuple:
+    canonical = canonical_requirements(requirements)
+    values = []
+    for field in sorted(fields):
+        value = canonical[field] if field in canonical else requirements.get(field)
+        values.append(json.dumps(value, sort_keys=True, default=str))
+    return tuple(values)
+
+class StageMemo:
+    """Memoizes stage outputs on their inputs and the requirement fields they read.
+
+    A stage runs once against a ``TrackedRequirements`` view; its output is then
+    stored under the fields it read and their canonical values. Later lookups
+    try every read set recorded for the stage, so changing a field a stage does
+    not read (e.g. a scale slider for pattern detection) reuses its output.
+    ``inputs_key`` must identify everything else the stage depends on, such as
+    the catalog version and upstream stage outputs.
+    """
+
+    def __init__(self, maxsize: int = STAGE_MEMO_SIZE):
+        self._cache = ResultCache(maxsize)
+        self._lock = threading.Lock()
+        self._read_sets: Dict[str, Set[FrozenSet[str]]] = {}
+
+    def read_fields(self, stage: str) -> FrozenSet[str]:
+        """Requirement fields the stage has been seen to read"""
+        return frozenset().union(*self._read_sets.get(stage, ()))
+
+    def compute(self, stage: str, requirements: Dict, inputs_key: Hashable,
+                compute: Callable[[Mapping], Any]) -> Tuple[Any, Hashable, bool]:
+        """Return ``(value, memo key, reused)`` for the stage, running it only on a miss"""
+        with self._lock:
+            read_sets = list(self._read_sets.get(stage, ()))
+        for fields in read_sets:
+            key = (stage, inputs_key, fields, _field_values(requirements, fields))
+            value = self._cache.get(key)
+            if value is not None:
+                return value, key, True
+
+        tracked = TrackedRequirements(requirements)
+        value = compute(tracked)
+        fields = frozenset(tracked.reads)
+        with self._lock:
+            self._read_sets.setdefault(stage, set()).add(fields)
+        key = (stage, inputs_key, fields, _field_values(requirements, fields))
+        self._cache.put(key, value)
+        return value, key, False
+
+    def clear(self) -> None:
+        self._cache.clear()
+        with self._lock:
+            self._read_sets.clear()
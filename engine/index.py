@@ -0,0 +1,162 @@
+"""Inverted catalog index"""
+import copy
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from .matching import KeywordMatcher, use_case_keywords
+from .records import Service
+from .resolver import ServiceResolver, normalize_service_name
+
+class PatternMask(NamedTuple):
+    """A pattern's service lists compiled to bitmasks over service bit IDs"""
+    required: int
+    recommended: int
+    optional: int
+    required_ids: Tuple[int, ...]
+    recommended_ids: Tuple[int, ...]
+
+def _bitmask(ids: Tuple[int, ...]) -> int:
+    mask = 0
+    for bit in ids:
+        mask |= 1 << bit
+    return mask
+
+def _bit_ids(mask: int) -> List[int]:
+    return [bit for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+def _postings(buckets: Dict[str, List[int]]) -> Dict[str, np.ndarray]:
+    return {key: np.array(sorted(set(rows)), dtype=np.int32) for key, rows in buckets.items()}
+
+class CatalogIndex:
+    """Inverted index over the service catalog, built once at catalog load.
+
+    Postings are sorted arrays of service IDs so callers can look up
+    candidate services instead of scanning every catalog record.
+    """
+
+    def __init__(self, services: Tuple[Service, ...], patterns: Dict[str, Dict],
+                 aliases: Dict[str, List[str]] = None):
+        self.services = services
+        self.size = len(services)
+        self.resolver = ServiceResolver(services, aliases or {})
+
+        use_cases, compliance, categories, subcategories, cost_tiers = {}, {}, {}, {}, {}
+        for service in services:
+            row = service.id
+            for uc in service.use_cases:
+                use_cases.setdefault(uc.lower(), []).append(row)
+            for framework in service.compliance:
+                compliance.setdefault(framework, []).append(row)
+            categories.setdefault(service.category, []).append(row)
+            subcategories.setdefault(service.subcategory, []).append(row)
+            cost_tiers.setdefault(service.cost_tier, []).append(row)
+
+        self.use_cases = _postings(use_cases)
+        self.compliance = _postings(compliance)
+        self.categories = _postings(categories)
+        self.subcategories = _postings(subcategories)
+        self.cost_tiers = _postings(cost_tiers)
+        self._index_patterns(patterns)
+
+    def with_patterns(self, patterns: Dict[str, Dict]) -> "CatalogIndex":
+        """Copy of this index with the pattern structures rebuilt and service postings reused"""
+        index = copy.copy(self)
+        index._index_patterns(patterns)
+        return index
+
+    def _index_patterns(self, patterns: Dict[str, Dict]) -> None:
+        # Pattern service lists as bitmasks. Catalog services use their ID as bit ID;
+        # services only named by patterns get IDs after the catalog so they always read as missing.
+        self.bit_names = [service.name for service in self.services]
+        external_bits: Dict[str, int] = {}
+        self.pattern_masks: Dict[str, PatternMask] = {}
+        for pattern_key, pattern in patterns.items():
+            id_lists = []
+            for list_name in ("required_services", "recommended_services", "optional_services"):
+                ids = []
+                for service_name in pattern[list_name]:
+                    bit = self.resolver.resolve(service_name)
+                    if bit is None:
+                        bit = external_bits.setdefault(normalize_service_name(service_name), len(self.bit_names))
+                        if bit == len(self.bit_names):
+                            self.bit_names.append(service_name)
+                    ids.append(bit)
+                id_lists.append(tuple(dict.fromkeys(ids)))
+            required_ids, recommended_ids, optional_ids = id_lists
+            self.pattern_masks[pattern_key] = PatternMask(
+                _bitmask(required_ids), _bitmask(recommended_ids), _bitmask(optional_ids),
+                required_ids, recommended_ids)
+
+        # Pattern membership, so pattern detection only visits patterns that can be relevant
+        self.patterns_by_service: Dict[int, List[str]] = {}
+        self.patterns_by_use_case: Dict[str, List[str]] = {}
+        for pattern_key, pattern in patterns.items():
+            masks = self.pattern_masks[pattern_key]
+            for service_id in _bit_ids(masks.required | masks.recommended | masks.optional):
+                self.patterns_by_service.setdefault(service_id, []).append(pattern_key)
+            for uc in dict.fromkeys(pattern["use_cases"]):
+                self.patterns_by_use_case.setdefault(uc, []).append(pattern_key)
+        # Patterns without required services are never "minimal", so they are always candidates
+        self.unconditional_patterns = [key for key, pattern in patterns.items() if not pattern["required_services"]]
+        self._pattern_order = {pattern_key: position for position, pattern_key in enumerate(patterns)}
+
+        # One automaton over every catalog and pattern use case, shared by scoring and pattern detection
+        keywords = use_case_keywords(list(dict.fromkeys(list(self.use_cases) + list(self.patterns_by_use_case))))
+        self.keyword_matcher = KeywordMatcher(
+            keywords, whole_words=[keyword for keyword, term in keywords.items() if keyword != term])
+
+    def _lookup(self, postings: Dict[str, np.ndarray], key: str) -> np.ndarray:
+        return postings.get(key, np.empty(0, dtype=np.int32))
+
+    def services_with_use_case(self, use_case: str) -> np.ndarray:
+        return self._lookup(self.use_cases, use_case.lower())
+
+    def services_with_compliance(self, framework: str) -> np.ndarray:
+        return self._lookup(self.compliance, framework)
+
+    def services_in_category(self, category: str) -> np.ndarray:
+        return self._lookup(self.categories, category)
+
+    def services_in_subcategory(self, subcategory: str) -> np.ndarray:
+        return self._lookup(self.subcategories, subcategory)
+
+    def services_in_cost_tier(self, cost_tier: str) -> np.ndarray:
+        return self._lookup(self.cost_tiers, cost_tier)
+
+    def rows_for(self, service_names: List[str]) -> np.ndarray:
+        """Catalog rows of the services the names or aliases refer to, skipping names outside the catalog"""
+        return np.array(sorted(self.resolver.resolve_all(service_names)), dtype=np.int32)
+
+    def selection_mask(self, service_ids: List[int]) -> int:
+        """Bitmask of the selected catalog services"""
+        return _bitmask(tuple(service_ids))
+
+    def names_in_mask(self, mask: int, ordered_ids: Tuple[int, ...]) -> List[str]:
+        """Service names for the bits of ``mask``, in the order given by ``ordered_ids``"""
+        return [self.bit_names[bit] for bit in ordered_ids if mask >> bit & 1]
+
+    def services_matching_capability(self, capability: str) -> np.ndarray:
+        """Services with a use case containing the normalized capability name"""
+        key = capability.lower().replace(" ", "_")
+        matches = [rows for uc, rows in self.use_cases.items() if key in uc]
+        if not matches:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(matches))
+
+    def matched_terms(self, text: str) -> set:
+        """Catalog and pattern use cases mentioned in free text, directly or via a synonym"""
+        return self.keyword_matcher.matched_terms(text)
+
+    def matched_use_cases(self, text: str) -> List[str]:
+        """Catalog use cases mentioned in free text"""
+        return [uc for uc in self.matched_terms(text) if uc in self.use_cases]
+
+    def candidate_patterns(self, selected_ids: List[int], aligned_use_cases: List[str]) -> List[str]:
+        """Patterns that share a service with the selection or a use case with the requirements"""
+        candidates = set(self.unconditional_patterns)
+        for service_id in selected_ids:
+            candidates.update(self.patterns_by_service.get(service_id, []))
+        for uc in aligned_use_cases:
+            candidates.update(self.patterns_by_use_case.get(uc, []))
+        return sorted(candidates, key=self._pattern_order.__getitem__)
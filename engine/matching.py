@@ -0,0 +1,111 @@
+"""Free-text keyword matching"""
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+# Phrasings that should count as a catalog or pattern use case when they
+# appear in free text. Space and hyphen spellings of multi-word use cases
+# ("real time", "real-time") are generated automatically.
+USE_CASE_SYNONYMS = {
+    "machine_learning": ["ai/ml", "predictive model"],
+    "generative_ai": ["genai", "gen ai", "large language model", "llm"],
+    "business_intelligence": ["bi dashboard", "bi report"],
+    "real_time": ["realtime", "near real time", "low latency"],
+    "etl": ["elt", "data ingestion"],
+    "iot": ["internet of things", "connected devices"],
+    "cicd": ["ci/cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "kubernetes": ["k8s"],
+    "chatbot": ["chat bot", "conversational ai", "copilot"],
+    "lift_shift": ["lift and shift", "rehost"],
+    "hybrid_cloud": ["on-premises", "on-prem"],
+    "disaster_recovery": ["failover region"],
+    "identity_management": ["single sign-on", "identity and access"],
+    "visualization": ["visualisation"],
+}
+
+class KeywordHit(NamedTuple):
+    start: int
+    end: int
+    keyword: str
+    term: str
+
+def use_case_keywords(use_cases: List[str]) -> Dict[str, str]:
+    """Map every literal, spelling variant and synonym to its canonical use case.
+
+    Keywords that differ from their use case should only match whole words
+    (see ``KeywordMatcher``); short synonyms such as "elt" or "llm" would
+    otherwise fire inside unrelated words ("delta", "shelter").
+    """
+    keywords = {}
+    for uc in use_cases:
+        keywords[uc] = uc
+        if "_" in uc:
+            keywords.setdefault(uc.replace("_", " "), uc)
+            keywords.setdefault(uc.replace("_", "-"), uc)
+    for uc, synonyms in USE_CASE_SYNONYMS.items():
+        if uc in keywords:
+            for synonym in synonyms:
+                keywords.setdefault(synonym, uc)
+    return keywords
+
+def _is_word_char(text: str, position: int) -> bool:
+    return 0 <= position < len(text) and (text[position].isalnum() or text[position] == "_")
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword in a text in one scan.
+
+    Matching is case-insensitive substring matching, the same semantics as
+    ``keyword in text.lower()``, and hit positions refer to the lowercased text.
+    Keywords in ``whole_words`` only match where neither neighbouring character
+    is a letter, digit or underscore.
+    """
+
+    def __init__(self, keywords: Dict[str, str], whole_words: Iterable[str] = ()):
+        self._whole_words = frozenset(keyword.lower() for keyword in whole_words)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[Tuple[str, str]]] = [[]]
+        for keyword, term in keywords.items():
+            keyword = keyword.lower()
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._outputs.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._outputs[state].append((keyword, term))
+
+        # Breadth-first failure links; each state inherits the outputs of its failure state
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0) if state else 0
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                queue.append(next_state)
+
+    def scan(self, text: str) -> Iterator[KeywordHit]:
+        """Yield every keyword occurrence, including overlapping ones"""
+        goto, fail, outputs, whole_words = self._goto, self._fail, self._outputs, self._whole_words
+        text = text.lower()
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, term in outputs[state]:
+                start = position - len(keyword) + 1
+                if keyword in whole_words and (_is_word_char(text, start - 1) or _is_word_char(text, position + 1)):
+                    continue
+                yield KeywordHit(start, position + 1, keyword, term)
+
+    def matched_terms(self, text: str) -> set:
+        """Canonical terms with at least one hit in the text"""
+        return {hit.term for hit in self.scan(text)}
@@ -0,0 +1,299 @@
+"""Single entry point that runs the full recommendation pipeline"""
+import math
+import threading
+import time
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Tuple
+
+from .analysis import (calculate_business_value, detect_architecture_patterns, generate_architecture_diagram,
+                       generate_cost_analysis, validate_architecture_completeness)
+from .cache import ResultCache, requirements_key, scoring_key
+from .catalog import Catalog
+from .incremental import StageMemo
+from .records import Service
+from .scheduler import STAGE_TIMEOUT_SECONDS, run_stage_graph
+from .scoring import MIN_SERVICE_SCORE, TOP_SERVICES_LIMIT, ScoredServices
+from .store import get_catalog
+
+# Lazy stages after scoring and the stages each one reads; all of them also read
+# the top services and the requirements
+STAGE_DEPENDENCIES = {
+    "patterns": (),
+    "cost_analysis": (),
+    "validation": (),
+    "business_value": (),
+    "diagram": ("patterns",)
+}
+ANALYSIS_STAGES = tuple(STAGE_DEPENDENCIES)
+
+# Results keyed by (catalog version, requirements key), shared by every caller in the process
+result_cache = ResultCache()
+# Individual stage outputs keyed by the requirement fields each stage read, so a
+# result for new requirements reuses every stage the change does not affect
+stage_memo = StageMemo()
+# Ranked services per catalog version and normalized scoring key, shared by every
+# session, so near-identical requirements are only scored once
+SCORING_CACHE_SIZE = 1024
+SCORING_CACHE_TTL_SECONDS = 900.0
+scoring_cache = ResultCache(maxsize=SCORING_CACHE_SIZE, ttl=SCORING_CACHE_TTL_SECONDS)
+# Latest unranked score without synergy per (catalog version, matched use cases, industry);
+# requirements that differ from it only in their capabilities are scored by applying the delta
+score_states = ResultCache(maxsize=64)
+
+class AnalysisResult:
+    """Everything the UI renders for one set of requirements.
+
+    Scoring runs up front; pattern detection, cost analysis, the diagram,
+    validation and business value are computed on first access and memoized,
+    so views that are never shown cost nothing. With a ``memo``, each stage is
+    also looked up by the requirement fields it reads, so only the stages
+    affected by a requirements change are recomputed. Results are shared
+    between callers, so treat every value as read-only. Only successful
+    stages are stored: a stage that fails is computed again on its next
+    access.
+    """
+
+    __slots__ = ("requirements", "requirements_key", "catalog", "scored_services", "services", "timings", "reused",
+                 "memo", "_services_key", "_stage_keys", "_stages", "_stage_locks", "_lock")
+
+    def __init__(self, requirements: Dict, requirements_key: str, catalog: Catalog,
+                 scored_services: ScoredServices, services: List[Service], timings: Dict[str, float],
+                 memo: StageMemo = None, reused: Set[str] = frozenset()):
+        self.requirements = requirements
+        self.requirements_key = requirements_key
+        self.catalog = catalog
+        self.scored_services = scored_services
+        self.services = services
+        # Seconds spent computing each stage, starting with "scoring"
+        self.timings = timings
+        # Stages served from the memo instead of being recomputed
+        self.reused = set(reused)
+        self.memo = memo
+        self._services_key = tuple(scored_services.service_ids.tolist())
+        self._stage_keys: Dict[str, Hashable] = {}
+        self._stages: Dict[str, Any] = {}
+        self._stage_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def catalog_version(self) -> str:
+        return self.catalog.version
+
+    @property
+    def computed_stages(self) -> List[str]:
+        """Lazy stages that have been computed so far"""
+        return list(self._stages)
+
+    def _stage(self, name: str, compute: Callable[[Mapping], Any]) -> Any:
+        value = self._stages.get(name)
+        if value is None:
+            # One lock per stage, so independent stages can be computed concurrently
+            with self._lock:
+                stage_lock = self._stage_locks.setdefault(name, threading.Lock())
+            with stage_lock:
+                value = self._stages.get(name)
+                if value is None:
+                    started = time.perf_counter()
+                    if self.memo is None:
+                        value = compute(self.requirements)
+                    else:
+                        upstream = STAGE_DEPENDENCIES[name]
+                        for dependency in upstream:
+                            getattr(self, dependency)
+                        inputs_key = (self.catalog.version, self._services_key,
+                                      tuple(self._stage_keys[dependency] for dependency in upstream))
+                        value, self._stage_keys[name], reused = self.memo.compute(
+                            name, self.requirements, inputs_key, compute)
+                        if reused:
+                            self.reused.add(name)
+                    self.timings[name] = time.perf_counter() - started
+                    self._stages[name] = value
+        return value
+
+    def stages(self, names: Tuple[str, ...] = ANALYSIS_STAGES,
+               timeout: float = STAGE_TIMEOUT_SECONDS) -> Iterator[Tuple[str, Any, Optional[BaseException]]]:
+        """Compute lazy stages in parallel, yielding ``(name, value, error)`` as each finishes.
+
+        A failing or timed-out stage skips the stages that depend on it without
+        affecting the others. Errors are only reported to this caller; the
+        result, which other callers share, keeps no record of them.
+        """
+        dependencies = {name: STAGE_DEPENDENCIES[name] for name in names}
+        yield from run_stage_graph(dependencies, lambda name: getattr(self, name), timeout)
+
+    @property
+    def service_names(self) -> List[str]:
+        return [svc.name for svc in self.services]
+
+    @property
+    def patterns(self) -> List[Dict]:
+        return self._stage("patterns", lambda requirements: detect_architecture_patterns(
+            self.services, requirements, self.catalog))
+
+    @property
+    def cost_analysis(self) -> Dict:
+        return self._stage("cost_analysis", lambda requirements: generate_cost_analysis(self.services, requirements))
+
+    @property
+    def diagram(self) -> str:
+        return self._stage("diagram", lambda requirements: generate_architecture_diagram(self.services, self.patterns))
+
+    @property
+    def validation(self) -> Tuple[List[str], List[str], List[str]]:
+        """Critical gaps, warnings and recommendations"""
+        return self._stage("validation", lambda requirements: validate_architecture_completeness(
+            self.services, requirements, self.catalog))
+
+    @property
+    def critical_gaps(self) -> List[str]:
+        return self.validation[0]
+
+    @property
+    def warnings(self) -> List[str]:
+        return self.validation[1]
+
+    @property
+    def recommendations(self) -> List[str]:
+        return self.validation[2]
+
+    @property
+    def business_value(self) -> Dict:
+        return self._stage("business_value", lambda requirements: calculate_business_value(
+            self.services, requirements))
+
+    def ranked_services(self) -> List[Dict]:
+        """JSON-serializable recommended services with their scores, best first"""
+        scored = self.scored_services
+        return [{"name": service.name, "category": service.category, "score": scored.total(position),
+                 "breakdown": scored.breakdown(position)}
+                for position, service in enumerate(self.services)]
+
+    def collect_stages(self, names: Tuple[str, ...] = ANALYSIS_STAGES,
+                       timeout: float = STAGE_TIMEOUT_SECONDS) -> Dict[str, Any]:
+        """Values of the named stages, computed in parallel by ``stages()``.
+
+        Raises the error of the first stage that fails or times out.
+        """
+        values = {}
+        for name, value, error in self.stages(names, timeout):
+            if error is not None:
+                raise error
+            values[name] = value
+        return values
+
+    def to_dict(self, diagram: bool = False) -> Dict:
+        """JSON-serializable analysis: ranked services and every stage, the diagram only on request"""
+        names = ("patterns", "cost_analysis", "validation", "business_value") + (("diagram",) if diagram else ())
+        stages = self.collect_stages(names)
+        critical_gaps, warnings, recommendations = stages.pop("validation")
+        return dict({
+            "catalog_version": self.catalog_version,
+            "requirements_key": self.requirements_key,
+            "services": self.ranked_services(),
+            "critical_gaps": critical_gaps,
+            "warnings": warnings,
+            "recommendations": recommendations
+        }, **stages)
+
+def analyze(requirements: Dict, catalog: Catalog = None, use_cache: bool = True) -> AnalysisResult:
+    """Score the catalog against the requirements and derive the full architecture analysis.
+
+    ``requirements`` holds ``use_case``, ``industry``, ``capabilities`` (name -> bool),
+    ``team_size``, ``expected_users`` and ``data_volume_gb``, and optionally ``top_k``
+    and ``min_score``: how many services to recommend and the score they must
+    exceed (``TOP_SERVICES_LIMIT`` and ``MIN_SERVICE_SCORE`` by default). The whole analysis runs
+    against one catalog version, the current shared catalog unless one is given.
+    Results are memoized per catalog version and canonical requirements, scoring
+    per normalized scoring key and stages per the requirement fields they read;
+    ``use_cache=False`` bypasses all of them.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    key = requirements_key(requirements)
+    if use_cache:
+        cached = result_cache.get((catalog.version, key))
+        if cached is not None:
+            return cached
+
+    result = _run_pipeline(requirements, key, catalog, stage_memo if use_cache else None)
+    if use_cache:
+        result_cache.put((catalog.version, key), result)
+    return result
+
+def validate_requirements(requirements: Any) -> Dict:
+    """Checked copy of requirements from an untrusted source, such as an API body or a batch file.
+
+    Raises ``ValueError`` describing the first invalid field. ``capabilities``
+    may also be a list of selected capability names, which is converted to the
+    name -> bool form; missing fields keep their defaults in ``analyze``.
+    """
+    if not isinstance(requirements, Mapping):
+        raise ValueError("requirements must be an object")
+    checked = dict(requirements)
+    for field in ("use_case", "industry"):
+        if not isinstance(checked.get(field, ""), str):
+            raise ValueError(f"{field} must be a string")
+    capabilities = checked.get("capabilities", {})
+    if isinstance(capabilities, list):
+        if not all(isinstance(cap, str) for cap in capabilities):
+            raise ValueError("capabilities must be a list of names or an object of name -> bool")
+        capabilities = {cap: True for cap in capabilities}
+    if not isinstance(capabilities, Mapping) or not all(
+            isinstance(cap, str) and isinstance(selected, bool) for cap, selected in capabilities.items()):
+        raise ValueError("capabilities must be a list of names or an object of name -> bool")
+    checked["capabilities"] = dict(capabilities)
+    for field in ("team_size", "expected_users", "data_volume_gb"):
+        value = checked.get(field, 0)
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+            raise ValueError(f"{field} must be a non-negative number, got {value!r}")
+    _ranking_limits(checked)
+    return checked
+
+def _ranking_limits(requirements: Mapping) -> Tuple[int, float]:
+    """Validated ``top_k`` and ``min_score`` of the requirements"""
+    top_k = requirements.get("top_k", TOP_SERVICES_LIMIT)
+    min_score = requirements.get("min_score", MIN_SERVICE_SCORE)
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        raise ValueError(f"top_k must be a positive integer, got {top_k!r}")
+    if isinstance(min_score, bool) or not isinstance(min_score, (int, float)) or not math.isfinite(min_score):
+        raise ValueError(f"min_score must be a finite number, got {min_score!r}")
+    return top_k, min_score
+
+def _score(requirements: Mapping, catalog: Catalog, states: ResultCache = None) -> ScoredServices:
+    top_k, min_score = _ranking_limits(requirements)
+    scoring_matrix = catalog.scoring_matrix
+    architecture_context = {"selected_services": []}
+    previous = None
+    if states is not None:
+        use_cases, industry = scoring_key(requirements, scoring_matrix)[:2]
+        state_key = (catalog.version, use_cases, industry)
+        previous = states.get(state_key)
+    if previous is None:
+        state = scoring_matrix.score_state(requirements, architecture_context)
+    else:
+        state = scoring_matrix.rescore_capabilities(previous, requirements.get("capabilities", {}))
+    if states is not None:
+        states.put(state_key, state)
+    # Synergy depends on which services are recommended, so it is added on top of
+    # the cached state rather than stored in it
+    state, _ = scoring_matrix.iterate_synergy(state, threshold=min_score, limit=top_k)
+    return scoring_matrix.rank_state(state, threshold=min_score, limit=top_k)
+
+def _run_pipeline(requirements: Dict, key: str, catalog: Catalog, memo: StageMemo = None) -> AnalysisResult:
+    started = time.perf_counter()
+    reused = set()
+    # Checked before the scoring key is built, so invalid limits never become cache keys
+    _ranking_limits(requirements)
+    if memo is None:
+        scored_services = _score(requirements, catalog)
+    else:
+        cache_key = (catalog.version,) + scoring_key(requirements, catalog.scoring_matrix)
+        scored_services = scoring_cache.get(cache_key)
+        if scored_services is None:
+            scored_services = _score(requirements, catalog, score_states)
+            scoring_cache.put(cache_key, scored_services)
+        else:
+            reused.add("scoring")
+    top_services = scored_services.services(catalog.services)
+    return AnalysisResult(requirements, key, catalog, scored_services, top_services,
+                          timings={"scoring": time.perf_counter() - started}, memo=memo, reused=reused)
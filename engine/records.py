@@ -0,0 +1,44 @@
+"""Immutable catalog records"""
+from dataclasses import dataclass, fields
+from typing import Dict, Tuple
+
+@dataclass(frozen=True, slots=True)
+class Service:
+    """Immutable catalog entry; ``id`` is its position in the shared catalog"""
+    id: int
+    name: str
+    category: str
+    subcategory: str
+    cost_tier: str
+    use_cases: Tuple[str, ...]
+    integrates_with: Tuple[str, ...]
+    compliance: Tuple[str, ...]
+    description: str
+    data_role: str
+    architectural_importance: str
+    pricing_model: str
+    docs: str
+    pricing: str
+
+    def __reduce__(self):
+        # Positional reconstruction unpickles much faster than the generic slots state
+        return (Service, tuple(getattr(self, field.name) for field in fields(Service)))
+
+    @classmethod
+    def from_dict(cls, service_id: int, data: Dict) -> "Service":
+        return cls(
+            id=service_id,
+            name=data["name"],
+            category=data.get("category", ""),
+            subcategory=data.get("subcategory", ""),
+            cost_tier=data.get("cost_tier", "medium"),
+            use_cases=tuple(data.get("use_cases", [])),
+            integrates_with=tuple(data.get("integrates_with", [])),
+            compliance=tuple(data.get("compliance", [])),
+            description=data.get("description", ""),
+            data_role=data.get("data_role", ""),
+            architectural_importance=data.get("architectural_importance", "medium"),
+            pricing_model=data.get("pricing_model", ""),
+            docs=data.get("docs", ""),
+            pricing=data.get("pricing", "")
+        )
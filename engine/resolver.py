@@ -0,0 +1,50 @@
+"""Canonical service IDs for the names catalog documents use to refer to services"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .records import Service
+
+def normalize_service_name(name: str) -> str:
+    """Lookup key for a service name: case-folded with whitespace collapsed"""
+    return " ".join(name.casefold().split())
+
+class ServiceResolver:
+    """Maps catalog service names and their aliases to service IDs.
+
+    Patterns, industries and integration lists refer to services by whatever
+    name their author used ("Synapse", "Azure AD"); ``aliases`` lists the other
+    names of each catalog service (data/aliases.json). Everything downstream
+    resolves those references once at catalog build and compares IDs.
+    """
+
+    def __init__(self, services: Tuple[Service, ...], aliases: Dict[str, List[str]]):
+        self.ids: Dict[str, int] = {normalize_service_name(service.name): service.id for service in services}
+        for name, alternatives in aliases.items():
+            service_id = self.ids[normalize_service_name(name)]
+            for alias in alternatives:
+                self.ids.setdefault(normalize_service_name(alias), service_id)
+
+    def resolve(self, name: str) -> Optional[int]:
+        """ID of the service the name refers to, or None outside the catalog"""
+        return self.ids.get(normalize_service_name(name))
+
+    def resolve_all(self, names: Iterable[str]) -> Tuple[int, ...]:
+        """IDs of the names that resolve, in order and without duplicates"""
+        return tuple(dict.fromkeys(service_id for service_id in map(self.resolve, names) if service_id is not None))
+
+def unresolved_references(resolver: ServiceResolver, services: Tuple[Service, ...], patterns: Dict[str, Dict],
+                          industries: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Service references that match no catalog name or alias, with where each one occurs"""
+    references = []
+    for service in services:
+        references.extend((name, f"services.{service.name}.integrates_with") for name in service.integrates_with)
+    for key, pattern in patterns.items():
+        for list_name in ("required_services", "recommended_services", "optional_services"):
+            references.extend((name, f"patterns.{key}.{list_name}") for name in pattern[list_name])
+    for key, industry in industries.items():
+        references.extend((name, f"industries.{key}.required_services") for name in industry["required_services"])
+
+    unresolved: Dict[str, List[str]] = {}
+    for name, where in references:
+        if resolver.resolve(name) is None:
+            unresolved.setdefault(name, []).append(where)
+    return dict(sorted(unresolved.items()))
@@ -0,0 +1,96 @@
+"""Parallel execution of analysis stages as a dependency graph"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stages run on threads: they share the in-memory catalog, which would have to be
+# pickled for every call on a process pool, and slow stages are expected to wait
+# on I/O (pricing APIs, pattern libraries) rather than hold the GIL.
+STAGE_WORKERS = 4
+STAGE_TIMEOUT_SECONDS = 10.0
+# How often stages still queued behind other work are checked for having started
+QUEUED_POLL_SECONDS = 0.05
+
+_executor = None
+
+class StageSkipped(RuntimeError):
+    """A stage did not run because one of its dependencies failed"""
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=STAGE_WORKERS, thread_name_prefix="analysis-stage")
+    return _executor
+
+def run_stage_graph(dependencies: Dict[str, Tuple[str, ...]], compute: Callable[[str], Any],
+                    timeout: float = STAGE_TIMEOUT_SECONDS) -> Iterator[Tuple[str, Any, Optional[BaseException]]]:
+    """Run stages concurrently as soon as their dependencies finish.
+
+    ``dependencies`` maps each stage to the stages it needs; dependencies outside
+    the graph are assumed to be satisfied. Yields ``(stage, value, error)`` in
+    completion order. A stage that raises or runs longer than ``timeout``
+    seconds is reported with its error and its dependants are skipped; the
+    other stages are unaffected. The timeout counts from when a stage starts
+    on a worker, so time spent queued behind other analyses' stages on the
+    shared pool is not held against it. A timed-out stage keeps running on its
+    worker, but its result is no longer waited for.
+    """
+    executor = _get_executor()
+    waiting = dict(dependencies)
+    finished, failed = set(), set()
+    running: Dict[Future, str] = {}
+    # Monotonic start time of each stage, set by the worker that runs it
+    started: Dict[str, float] = {}
+
+    def run(stage):
+        started[stage] = time.monotonic()
+        return compute(stage)
+
+    def submit_ready():
+        for stage, needs in list(waiting.items()):
+            blocked = [need for need in needs if need in dependencies and need not in finished]
+            if any(need in failed for need in blocked):
+                continue
+            if not blocked:
+                del waiting[stage]
+                running[executor.submit(run, stage)] = stage
+
+    def skip_dependants(stage):
+        for dependant, needs in list(waiting.items()):
+            if stage in needs:
+                del waiting[dependant]
+                failed.add(dependant)
+                yield dependant, None, StageSkipped(f"{dependant} needs {stage}, which failed")
+                yield from skip_dependants(dependant)
+
+    submit_ready()
+    while running:
+        deadlines = [started[stage] + timeout for stage in running.values() if stage in started]
+        wait_seconds = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        if len(deadlines) < len(running):
+            # Queued stages get their deadline once they start, which wait() is not told about
+            wait_seconds = QUEUED_POLL_SECONDS if wait_seconds is None else min(wait_seconds, QUEUED_POLL_SECONDS)
+        done, _ = wait(running, timeout=wait_seconds, return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+        for future in list(running):
+            stage = running[future]
+            if future in done:
+                error = future.exception()
+                value = None if error else future.result()
+            elif stage in started and now >= started[stage] + timeout:
+                error, value = TimeoutError(f"{stage} did not finish within {timeout:g}s"), None
+            else:
+                continue
+            del running[future]
+            if error is None:
+                finished.add(stage)
+            else:
+                failed.add(stage)
+                logger.warning("Analysis stage %s failed: %s", stage, error)
+            yield stage, value, error
+            if error is not None:
+                yield from skip_dependants(stage)
+        submit_ready()
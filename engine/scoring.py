@@ -0,0 +1,440 @@
+"""Service scoring: the reference scorer and the vectorized engine"""
+import copy
+import math
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple
+
+import numpy as np
+
+from .graph import IntegrationGraph
+from .index import CatalogIndex
+from .records import Service
+
+# Capabilities offered in the requirements sidebar
+CAPABILITY_CATEGORIES = {
+    "Data & Analytics": [
+        "Data Warehousing", "Real-time Analytics", "Business Intelligence", 
+        "ETL/Data Integration", "Big Data Processing"
+    ],
+    "AI & Machine Learning": [
+        "Machine Learning", "Generative AI", "Computer Vision", 
+        "Natural Language Processing", "Predictive Analytics"
+    ],
+    "Application Platform": [
+        "Web Applications", "APIs", "Microservices", "Serverless", 
+        "Mobile Backend", "Integration"
+    ],
+    "Infrastructure": [
+        "Containers", "Virtual Machines", "DevOps/CI-CD", 
+        "Monitoring", "Security", "Networking"
+    ],
+    "Specialized": [
+        "IoT", "Edge Computing", "Blockchain", "Gaming", 
+        "Content Delivery", "Backup & DR"
+    ]
+}
+
+# Scoring weights shared by the reference scorer and the vectorized engine
+SCORE_COMPONENTS = (
+    "functional_alignment",
+    "architectural_fit",
+    "compliance_match",
+    "integration_synergy",
+    "cost_efficiency",
+    "industry_relevance",
+    "innovation_factor"
+)
+IMPORTANCE_SCORES = {"critical": 20, "high": 15, "medium": 10, "low": 5}
+COST_TIER_SCORES = {"free": 10, "low": 8, "medium": 6, "high": 3, "variable": 5}
+INNOVATIVE_SERVICES = ["Azure OpenAI Service", "Microsoft Fabric", "Azure Digital Twins", 
+                       "Azure Container Apps", "Azure Machine Learning"]
+# Industries with industry-relevance rules in the scorers; any other industry scores 0
+RELEVANCE_INDUSTRIES = ("healthcare", "financial", "government", "technology", "startup", "manufacturing")
+# Default request parameters: services must score above the threshold to be
+# recommended and at most the limit are kept
+MIN_SERVICE_SCORE = 10
+TOP_SERVICES_LIMIT = 20
+# Re-rankings allowed before integration synergy is considered converged
+SYNERGY_MAX_ITERATIONS = 10
+
+@dataclass(frozen=True, slots=True)
+class ScoredServices:
+    """Ranked scoring result that references catalog services by ID"""
+    service_ids: np.ndarray
+    totals: np.ndarray
+    breakdowns: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.service_ids)
+
+    def total(self, position: int) -> int:
+        return int(self.totals[position])
+
+    def breakdown(self, position: int) -> Dict[str, int]:
+        return {component: int(value) for component, value in zip(SCORE_COMPONENTS, self.breakdowns[position])}
+
+    def services(self, catalog: Tuple[Service, ...]) -> List[Service]:
+        return [catalog[service_id] for service_id in self.service_ids]
+
+@dataclass(frozen=True, slots=True)
+class ScoreState:
+    """Unranked scores of every service, one column per component.
+
+    Kept so that a later change to the selected capabilities can be applied as
+    a delta (see ``ScoringMatrix.rescore_capabilities``) instead of rescoring.
+    """
+    capabilities: FrozenSet[str]
+    capability_matches: np.ndarray
+    text_matches: np.ndarray
+    components: Tuple[np.ndarray, ...]
+    totals: np.ndarray
+
+    def breakdown(self, rows: np.ndarray = None) -> np.ndarray:
+        """Services x components matrix, for all services or only the given rows"""
+        if rows is None:
+            return np.column_stack(self.components)
+        return np.column_stack([component[rows] for component in self.components])
+
+
+def calculate_comprehensive_score(service: Service, requirements: Dict, architecture_context: Dict,
+                                  index: CatalogIndex, industries: Dict[str, Dict]) -> Tuple[int, Dict]:
+    """Enhanced scoring algorithm with detailed analysis"""
+    score_breakdown = {component: 0 for component in SCORE_COMPONENTS}
+    
+    use_case_text = requirements.get("use_case", "").lower()
+    selected_capabilities = requirements.get("capabilities", {})
+    industry = requirements.get("industry", "")
+    
+    # 1. Functional Alignment (0-25 points)
+    service_use_cases = [uc.lower() for uc in service.use_cases]
+    capability_matches = sum(1 for cap, selected in selected_capabilities.items() 
+                           if selected and cap.lower().replace(" ", "_") in " ".join(service_use_cases))
+    
+    mentioned_use_cases = index.matched_terms(use_case_text)
+    text_matches = sum(3 for uc in service_use_cases if uc in mentioned_use_cases)
+    score_breakdown["functional_alignment"] = min(25, capability_matches * 4 + text_matches)
+    
+    # 2. Architectural Fit (0-20 points)
+    score_breakdown["architectural_fit"] = IMPORTANCE_SCORES.get(service.architectural_importance, 10)
+    
+    # 3. Compliance Match (0-15 points)
+    if industry in industries:
+        industry_reqs = industries[industry]
+        service_compliance = service.compliance
+        required_frameworks = industry_reqs["compliance_frameworks"]
+        
+        compliance_score = sum(3 for framework in required_frameworks if framework in service_compliance)
+        if service.id in index.resolver.resolve_all(industry_reqs["required_services"]):
+            compliance_score += 6
+        score_breakdown["compliance_match"] = min(15, compliance_score)
+    
+    # 4. Integration Synergy (0-15 points)
+    selected_services = architecture_context.get("selected_services", [])
+    integration_partners = set(index.resolver.resolve_all(service.integrates_with)) - {service.id}
+    synergy_score = sum(2 for selected in selected_services 
+                       if index.resolver.resolve(selected) in integration_partners)
+    score_breakdown["integration_synergy"] = min(15, synergy_score)
+    
+    # 5. Cost Efficiency (0-10 points)
+    score_breakdown["cost_efficiency"] = COST_TIER_SCORES.get(service.cost_tier, 6)
+    
+    # 6. Industry Relevance (0-10 points)
+    if industry and industry in ["healthcare", "financial", "government"]:
+        if service.category in ["Security & Identity", "Monitoring & Management"]:
+            score_breakdown["industry_relevance"] = 8
+        elif "HIPAA" in service.compliance or "FedRAMP" in service.compliance:
+            score_breakdown["industry_relevance"] = 10
+    elif industry in ["technology", "startup"]:
+        if service.category in ["AI & Machine Learning", "DevOps & Developer Tools"]:
+            score_breakdown["industry_relevance"] = 8
+    elif industry == "manufacturing":
+        if service.category in ["IoT & Edge", "Analytics & BI"]:
+            score_breakdown["industry_relevance"] = 8
+    
+    # 7. Innovation Factor (0-5 points)
+    if service.name in INNOVATIVE_SERVICES:
+        score_breakdown["innovation_factor"] = 5
+    elif service.category == "AI & Machine Learning":
+        score_breakdown["innovation_factor"] = 3
+    
+    total_score = sum(score_breakdown.values())
+    return total_score, score_breakdown
+
+class ScoringMatrix:
+    """Catalog compiled into NumPy feature matrices for batched scoring.
+
+    Produces the same totals and breakdowns as ``calculate_comprehensive_score``
+    for every service in a single pass. Row ``i`` holds the service with ID ``i``.
+    """
+
+    def __init__(self, services: Tuple[Service, ...], index: CatalogIndex, industries: Dict[str, Dict]):
+        self.index = index
+        self.names = [service.name for service in services]
+        self.size = len(services)
+        service_use_cases = [[uc.lower() for uc in service.use_cases] for service in services]
+        self.integration_graph = IntegrationGraph(services, index.resolver)
+        # Most synergy each service can gain: 2 points per service it integrates with
+        self.max_synergy = np.minimum(15, 2 * np.diff(self.integration_graph.indptr)).astype(np.int16)
+
+        # services x use cases (occurrence counts, so duplicated use cases score twice),
+        # stored use-case-major so summing the matched use cases reads contiguous rows
+        self.use_case_vocab = sorted({uc for use_cases in service_use_cases for uc in use_cases})
+        self.use_case_columns = {uc: col for col, uc in enumerate(self.use_case_vocab)}
+        self.use_case_matrix = np.zeros((len(self.use_case_vocab), self.size), dtype=np.int16)
+        for row, use_cases in enumerate(service_use_cases):
+            for uc in use_cases:
+                self.use_case_matrix[self.use_case_columns[uc], row] += 1
+
+        # services x compliance frameworks
+        self.framework_vocab = sorted(index.compliance)
+        self.framework_columns = {fw: col for col, fw in enumerate(self.framework_vocab)}
+        self.compliance_matrix = np.zeros((self.size, len(self.framework_vocab)), dtype=bool)
+        for framework, rows in index.compliance.items():
+            self.compliance_matrix[rows, self.framework_columns[framework]] = True
+
+        # services x categories
+        self.category_vocab = sorted(index.categories, key=str)
+        self.category_columns = {cat: col for col, cat in enumerate(self.category_vocab)}
+        self.category_matrix = np.zeros((self.size, len(self.category_vocab)), dtype=bool)
+        for category, rows in index.categories.items():
+            self.category_matrix[rows, self.category_columns[category]] = True
+
+        # Components that depend only on the service
+        self.architectural_fit = np.array(
+            [IMPORTANCE_SCORES.get(service.architectural_importance, 10) for service in services],
+            dtype=np.int16)
+        self.cost_efficiency = np.full(self.size, 6, dtype=np.int16)
+        for cost_tier, rows in index.cost_tiers.items():
+            self.cost_efficiency[rows] = COST_TIER_SCORES.get(cost_tier, 6)
+        is_innovative = np.array([name in INNOVATIVE_SERVICES for name in self.names], dtype=bool)
+        self.innovation_factor = np.where(
+            is_innovative, 5, np.where(self._category_mask(["AI & Machine Learning"]), 3, 0)).astype(np.int16)
+        self.static_totals = np.sum([self.architectural_fit, self.cost_efficiency, self.innovation_factor],
+                                    axis=0, dtype=np.int64)
+        self._compile_industries(industries)
+
+        # Position of each service in name order, the tie-breaker when ranking
+        self.name_rank = np.empty(self.size, dtype=np.int32)
+        self.name_rank[sorted(range(self.size), key=self.names.__getitem__)] = np.arange(self.size, dtype=np.int32)
+        self._zeros = np.zeros(self.size, dtype=np.int16)
+        self._zeros.flags.writeable = False
+
+        # Columns of the sidebar capabilities; the matrix is shared and read-only
+        # afterwards, so other capability names are never added
+        self._capability_columns: Dict[str, np.ndarray] = {}
+        for caps in CAPABILITY_CATEGORIES.values():
+            for cap in caps:
+                key = cap.lower().replace(" ", "_")
+                self._capability_columns[key] = self._match_capability(key)
+
+    def _compile_industries(self, industries: Dict[str, Dict]) -> None:
+        # Industry-mandated services
+        self.industries = industries
+        self.required_service_masks = {}
+        for industry, industry_reqs in industries.items():
+            mask = np.zeros(self.size, dtype=bool)
+            mask[self.index.rows_for(industry_reqs["required_services"])] = True
+            self.required_service_masks[industry] = mask
+
+        # Compliance match and industry relevance depend only on service x industry, so
+        # they are tabulated per industry together with the totals of every component
+        # that does not depend on the request. Unlisted industries score like no industry.
+        self.industry_tables: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        for industry in dict.fromkeys(("",) + tuple(industries) + RELEVANCE_INDUSTRIES):
+            compliance_match = self._compliance_match(industry)
+            industry_relevance = self._industry_relevance(industry)
+            static_totals = self.static_totals + compliance_match + industry_relevance
+            for column in (compliance_match, industry_relevance, static_totals):
+                column.flags.writeable = False
+            self.industry_tables[industry] = (compliance_match, industry_relevance, static_totals)
+
+    def _compliance_match(self, industry: str) -> np.ndarray:
+        if industry not in self.industries:
+            return np.zeros(self.size, dtype=np.int16)
+        industry_reqs = self.industries[industry]
+        framework_columns = [self.framework_columns[fw] for fw in industry_reqs["compliance_frameworks"]
+                             if fw in self.framework_columns]
+        compliance_score = 3 * self.compliance_matrix[:, framework_columns].sum(axis=1, dtype=np.int16)
+        compliance_score = compliance_score + np.where(self.required_service_masks[industry], 6, 0)
+        return np.minimum(15, compliance_score).astype(np.int16)
+
+    def _industry_relevance(self, industry: str) -> np.ndarray:
+        if industry in ["healthcare", "financial", "government"]:
+            return np.where(
+                self._category_mask(["Security & Identity", "Monitoring & Management"]), 8,
+                np.where(self._compliance_mask(["HIPAA", "FedRAMP"]), 10, 0)).astype(np.int16)
+        elif industry in ["technology", "startup"]:
+            return np.where(
+                self._category_mask(["AI & Machine Learning", "DevOps & Developer Tools"]), 8, 0).astype(np.int16)
+        elif industry == "manufacturing":
+            return np.where(self._category_mask(["IoT & Edge", "Analytics & BI"]), 8, 0).astype(np.int16)
+        return np.zeros(self.size, dtype=np.int16)
+
+    def rebind(self, index: CatalogIndex, industries: Dict[str, Dict]) -> "ScoringMatrix":
+        """Copy sharing the service matrices, bound to a new index and industry table"""
+        matrix = copy.copy(self)
+        matrix.index = index
+        matrix._compile_industries(industries)
+        return matrix
+
+    def _category_mask(self, categories: List[str]) -> np.ndarray:
+        columns = [self.category_columns[cat] for cat in categories if cat in self.category_columns]
+        return self.category_matrix[:, columns].any(axis=1)
+
+    def _compliance_mask(self, frameworks: List[str]) -> np.ndarray:
+        columns = [self.framework_columns[fw] for fw in frameworks if fw in self.framework_columns]
+        return self.compliance_matrix[:, columns].any(axis=1)
+
+    def _match_capability(self, key: str) -> np.ndarray:
+        column = np.zeros(self.size, dtype=np.int16)
+        column[self.index.services_matching_capability(key)] = 1
+        return column
+
+    def capability_column(self, capability: str) -> np.ndarray:
+        """Services whose use cases contain the normalized capability name.
+
+        Sidebar capabilities are precompiled; any other name, e.g. from an API
+        body, is matched on every call rather than cached.
+        """
+        key = capability.lower().replace(" ", "_")
+        column = self._capability_columns.get(key)
+        return self._match_capability(key) if column is None else column
+
+    def synergy_column(self, selected_name: str) -> np.ndarray:
+        """Services that integrate with a selected service"""
+        column = np.zeros(self.size, dtype=np.int16)
+        selected_id = self.index.resolver.resolve(selected_name)
+        if selected_id is not None:
+            column[self.integration_graph.integrators_of([selected_id])] = 1
+        return column
+
+    def score_state(self, requirements: Dict, architecture_context: Dict) -> "ScoreState":
+        """Score every service at once, keeping each component as its own column"""
+        use_case_text = requirements.get("use_case", "").lower()
+        selected_capabilities = requirements.get("capabilities", {})
+        industry = requirements.get("industry", "")
+        components = [self._zeros] * len(SCORE_COMPONENTS)
+
+        # 1. Functional Alignment
+        capabilities = frozenset(cap for cap, selected in selected_capabilities.items() if selected)
+        capability_matches = np.zeros(self.size, dtype=np.int16)
+        for cap in capabilities:
+            capability_matches += self.capability_column(cap)
+        matched_use_cases = [self.use_case_columns[uc] for uc in self.index.matched_use_cases(use_case_text)]
+        text_matches = 3 * self.use_case_matrix[matched_use_cases].sum(axis=0, dtype=np.int16)
+        components[0] = np.minimum(25, capability_matches * 4 + text_matches).astype(np.int16)
+
+        # 2. Architectural Fit, 5. Cost Efficiency and 7. Innovation Factor depend only on
+        # the service; 3. Compliance Match and 6. Industry Relevance only on the industry
+        compliance_match, industry_relevance, static_totals = self.industry_tables.get(
+            industry, self.industry_tables[""])
+        components[1] = self.architectural_fit
+        components[2] = compliance_match
+        components[4] = self.cost_efficiency
+        components[5] = industry_relevance
+        components[6] = self.innovation_factor
+
+        # 4. Integration Synergy
+        synergy_score = np.zeros(self.size, dtype=np.int16)
+        for selected_name in architecture_context.get("selected_services", []):
+            synergy_score += 2 * self.synergy_column(selected_name)
+        components[3] = np.minimum(15, synergy_score)
+
+        totals = static_totals + components[0] + components[3]
+        return ScoreState(capabilities, capability_matches, text_matches, tuple(components), totals)
+
+    def score(self, requirements: Dict, architecture_context: Dict) -> Tuple[np.ndarray, np.ndarray]:
+        """Score every service at once, returning totals and a services x components breakdown"""
+        state = self.score_state(requirements, architecture_context)
+        return state.totals, state.breakdown()
+
+    def rescore_capabilities(self, state: "ScoreState", capabilities: Dict[str, bool]) -> "ScoreState":
+        """Apply a change of selected capabilities to an existing score.
+
+        Only the functional-alignment column depends on the capabilities, so the
+        toggled capability columns are added or subtracted, that one column is
+        recomputed and the totals are adjusted by its difference. Every other
+        component column is shared with ``state``.
+        """
+        selected = frozenset(cap for cap, on in capabilities.items() if on)
+        if selected == state.capabilities:
+            return state
+        capability_matches = state.capability_matches.copy()
+        for cap in selected - state.capabilities:
+            capability_matches += self.capability_column(cap)
+        for cap in state.capabilities - selected:
+            capability_matches -= self.capability_column(cap)
+        functional_alignment = np.minimum(25, capability_matches * 4 + state.text_matches).astype(np.int16)
+        totals = state.totals + (functional_alignment - state.components[0])
+        components = (functional_alignment,) + state.components[1:]
+        return ScoreState(selected, capability_matches, state.text_matches, components, totals)
+
+    def iterate_synergy(self, state: "ScoreState", threshold: float, limit: int,
+                        max_iterations: int = SYNERGY_MAX_ITERATIONS) -> Tuple["ScoreState", int]:
+        """Add integration synergy with the recommended services until the ranking settles.
+
+        Starts from the scores without synergy, ranks them, credits every service
+        with 2 points (at most 15) per ranked service it integrates with and ranks
+        again, until the ranked set stops changing, repeats an earlier set or
+        ``max_iterations`` is reached. Each round only rescores the integrators of
+        services that entered or left the ranked set, and only ranks services
+        that can still reach the top ``limit``. Returns the final state and the
+        number of rounds that changed synergy.
+        """
+        graph = self.integration_graph
+        counts = np.zeros(self.size, dtype=np.int16)
+        synergy = np.zeros(self.size, dtype=np.int16)
+        totals = state.totals - state.components[3]
+        candidates = self._synergy_candidates(totals, threshold, limit)
+        selected = np.empty(0, dtype=np.int32)
+        seen = {selected.tobytes()}
+        iterations = 0
+        while iterations < max_iterations:
+            ranked = np.sort(self._ranked_rows(totals, threshold, limit, candidates))
+            if ranked.tobytes() in seen:
+                break
+            seen.add(ranked.tobytes())
+            gained = graph.integrators_of(np.setdiff1d(ranked, selected, assume_unique=True))
+            lost = graph.integrators_of(np.setdiff1d(selected, ranked, assume_unique=True))
+            np.add.at(counts, gained, 1)
+            np.subtract.at(counts, lost, 1)
+            changed = np.unique(np.concatenate((gained, lost)))
+            changed_synergy = np.minimum(15, 2 * counts[changed]).astype(np.int16)
+            totals[changed] += changed_synergy - synergy[changed]
+            synergy[changed] = changed_synergy
+            selected = ranked
+            iterations += 1
+
+        components = state.components[:3] + (synergy,) + state.components[4:]
+        return ScoreState(state.capabilities, state.capability_matches, state.text_matches,
+                          components, totals), iterations
+
+    def _synergy_candidates(self, base_totals: np.ndarray, threshold: float, limit: int) -> np.ndarray:
+        # Synergy only adds points, so the limit-th best total never drops below the
+        # limit-th best base total; services that cannot reach it even with their
+        # maximum synergy can never be ranked and are left out of every round
+        above = base_totals[base_totals > threshold]
+        # Totals are whole numbers, so the lowest one above a fractional threshold is its floor + 1
+        floor = math.floor(threshold) + 1
+        if len(above) >= limit:
+            floor = max(floor, np.partition(above, len(above) - limit)[len(above) - limit])
+        return np.flatnonzero(base_totals + self.max_synergy >= floor)
+
+    def _ranked_rows(self, totals: np.ndarray, threshold: int, limit: int, rows: np.ndarray = None) -> np.ndarray:
+        rows = np.flatnonzero(totals > threshold) if rows is None else rows[totals[rows] > threshold]
+        if len(rows) > limit:
+            # Select the limit-th best total in linear time; only services reaching it are sorted
+            kth_best = np.partition(totals[rows], len(rows) - limit)[len(rows) - limit]
+            rows = rows[totals[rows] >= kth_best]
+        order = np.lexsort((self.name_rank[rows], -totals[rows]))[:limit]
+        return rows[order].astype(np.int32)
+
+    def rank(self, totals: np.ndarray, breakdowns: np.ndarray, threshold: int, limit: int) -> ScoredServices:
+        """Services scoring above the threshold, best first with ties broken by name"""
+        service_ids = self._ranked_rows(totals, threshold, limit)
+        return ScoredServices(service_ids, totals[service_ids], breakdowns[service_ids])
+
+    def rank_state(self, state: "ScoreState", threshold: int, limit: int) -> ScoredServices:
+        """Like ``rank``, assembling breakdowns only for the ranked services"""
+        service_ids = self._ranked_rows(state.totals, threshold, limit)
+        return ScoredServices(service_ids, state.totals[service_ids], state.breakdown(service_ids))
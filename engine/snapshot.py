@@ -0,0 +1,106 @@
+"""Precompiled, memory-mapped catalog snapshots"""
+import io
+import json
+import math
+import mmap
+import os
+import pickle
+import struct
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .catalog import Catalog
+
+# Layout: magic | header length | JSON header | pickle payload | 64-byte aligned
+# array region. The payload pickles the Catalog with every NumPy array replaced
+# by a reference into the array region, so loading maps the file and hands out
+# read-only array views without copying or recompiling anything. Only load
+# snapshots produced by build_snapshot.py from trusted data files.
+SNAPSHOT_MAGIC = b"AZDSNAP1"
+SNAPSHOT_FORMAT = 8
+_SNAPSHOT_ALIGNMENT = 64
+# Smaller arrays (e.g. most index postings) are cheaper to pickle inline than to map
+_SNAPSHOT_MIN_MAPPED_BYTES = 4096
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _SNAPSHOT_ALIGNMENT) * _SNAPSHOT_ALIGNMENT
+
+class _SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, arrays: List[np.ndarray]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray) and obj.dtype != object and obj.nbytes >= _SNAPSHOT_MIN_MAPPED_BYTES:
+            self.arrays.append(np.ascontiguousarray(obj))
+            return len(self.arrays) - 1
+        return None
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, views: List[np.ndarray]):
+        super().__init__(file)
+        self.views = views
+
+    def persistent_load(self, pid):
+        return self.views[pid]
+
+def write_catalog_snapshot(path: Path, catalog: Catalog, digests: Dict[str, str]) -> None:
+    """Serialize a built catalog, its indexes and scoring matrices into one mappable file"""
+    arrays: List[np.ndarray] = []
+    payload = io.BytesIO()
+    _SnapshotPickler(payload, arrays).dump(catalog)
+
+    array_specs, offset = [], 0
+    for array in arrays:
+        offset = _aligned(offset)
+        array_specs.append({"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+        offset += array.nbytes
+    header = json.dumps({
+        "format": SNAPSHOT_FORMAT,
+        "catalog_version": catalog.version,
+        "source_digests": digests,
+        "payload_size": len(payload.getbuffer()),
+        "arrays": array_specs
+    }).encode("utf-8")
+
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(SNAPSHOT_MAGIC + struct.pack("<Q", len(header)) + header)
+        f.write(payload.getbuffer())
+        region_start = _aligned(f.tell())
+        f.write(b"\0" * (region_start - f.tell()))
+        for array, spec in zip(arrays, array_specs):
+            f.write(b"\0" * (region_start + spec["offset"] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_path, path)
+
+def read_snapshot_header(buffer) -> Tuple[Dict, int]:
+    if buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+        raise ValueError("not a catalog snapshot")
+    header_start = len(SNAPSHOT_MAGIC) + 8
+    if len(buffer) < header_start:
+        raise ValueError("truncated catalog snapshot")
+    (header_size,) = struct.unpack_from("<Q", buffer, len(SNAPSHOT_MAGIC))
+    if len(buffer) < header_start + header_size:
+        raise ValueError("truncated catalog snapshot")
+    header = json.loads(bytes(buffer[header_start:header_start + header_size]))
+    if header.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"unsupported snapshot format {header.get('format')}")
+    return header, header_start + header_size
+
+def load_catalog_snapshot(path: Path) -> Tuple[Catalog, Dict[str, str]]:
+    """Map a snapshot file and return its catalog and the digests of its source files"""
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    header, payload_start = read_snapshot_header(buffer)
+    payload_end = payload_start + header["payload_size"]
+    region_start = _aligned(payload_end)
+    views = [
+        np.frombuffer(buffer, dtype=np.dtype(spec["dtype"]), count=math.prod(spec["shape"]),
+                      offset=region_start + spec["offset"]).reshape(spec["shape"])
+        for spec in header["arrays"]
+    ]
+    catalog = _SnapshotUnpickler(io.BytesIO(buffer[payload_start:payload_end]), views).load()
+    return catalog, header["source_digests"]
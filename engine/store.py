@@ -0,0 +1,138 @@
+"""Loading and hot-reloading the shared catalog"""
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from .catalog import (CATALOG_DATA_DIR, CATALOG_FILES, CATALOG_SNAPSHOT_PATH, RELOAD_CHECK_SECONDS, Catalog,
+                      CatalogValidationError, catalog_version, parse_catalog_file, validate_catalog_data)
+from .snapshot import load_catalog_snapshot, write_catalog_snapshot
+
+logger = logging.getLogger(__name__)
+
+class CatalogStore:
+    """Loads the catalog data files and hot-reloads them when they change.
+
+    Files are re-stat'ed at most every ``check_interval`` seconds; a file is
+    only re-read when its mtime or size moved, and the catalog is only rebuilt
+    when its content hash changed. An invalid update is logged and the last
+    good catalog keeps being served.
+    """
+
+    def __init__(self, data_dir: Path = CATALOG_DATA_DIR, check_interval: float = RELOAD_CHECK_SECONDS,
+                 snapshot_path: str = CATALOG_SNAPSHOT_PATH):
+        self.data_dir = Path(data_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._digests: Dict[str, str] = {}
+        self._data: Dict[str, Any] = {}
+        self._catalog = None
+        self._rejected = None
+        self._next_check = 0.0
+        if snapshot_path and os.path.exists(snapshot_path):
+            self._load_snapshot(Path(snapshot_path))
+        if self._catalog is None and not self.reload_if_changed():
+            raise CatalogValidationError(f"No valid catalog could be loaded from {self.data_dir}")
+
+    def _load_snapshot(self, snapshot_path: Path) -> None:
+        """Adopt a precompiled snapshot if it was built from the current data files"""
+        try:
+            signatures, digests = {}, {}
+            for part, filename in CATALOG_FILES.items():
+                path = self.data_dir / filename
+                stat = path.stat()
+                signatures[part] = (stat.st_mtime_ns, stat.st_size)
+                digests[part] = hashlib.sha256(path.read_bytes()).hexdigest()
+            catalog, snapshot_digests = load_catalog_snapshot(snapshot_path)
+        except (OSError, ValueError, KeyError, EOFError, struct.error, pickle.UnpicklingError) as exc:
+            # A truncated or corrupt snapshot falls back to compiling the data files
+            logger.warning("Ignoring catalog snapshot %s: %s", snapshot_path, exc)
+            return
+        if snapshot_digests != digests:
+            logger.info("Catalog snapshot %s is stale; compiling from data files", snapshot_path)
+            return
+        # Parsed documents are only needed to merge a later partial update; they are read back on demand
+        self._signatures, self._digests, self._catalog = signatures, digests, catalog
+        logger.info("Loaded catalog version %s from snapshot %s", catalog.version, snapshot_path)
+
+    def snapshot(self, path: Path) -> None:
+        """Write the current catalog and its derived structures to a snapshot file"""
+        with self._lock:
+            write_catalog_snapshot(path, self._catalog, self._digests)
+
+    def current(self) -> Catalog:
+        if time.monotonic() >= self._next_check:
+            self.reload_if_changed()
+        return self._catalog
+
+    def reload_if_changed(self) -> bool:
+        """Reload changed data files; returns True when a new catalog was published"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            updates = {}
+            for part, filename in CATALOG_FILES.items():
+                path = self.data_dir / filename
+                stat = path.stat()
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(part) == signature:
+                    continue
+                self._signatures[part] = signature
+                raw = path.read_bytes()
+                digest = hashlib.sha256(raw).hexdigest()
+                if self._digests.get(part) != digest:
+                    updates[part] = (digest, raw)
+            if not updates:
+                return False
+            attempt = frozenset((part, digest) for part, (digest, raw) in updates.items())
+            if attempt == self._rejected:
+                return False
+
+            try:
+                data = dict(self._data)
+                for part, (digest, raw) in updates.items():
+                    data[part] = parse_catalog_file(raw, part)
+                for part, filename in CATALOG_FILES.items():
+                    if part not in data:
+                        data[part] = parse_catalog_file((self.data_dir / filename).read_bytes(), part)
+                validate_catalog_data(data["services"], data["patterns"], data["industries"], data["aliases"])
+            except (CatalogValidationError, ValueError) as exc:
+                # Forget the signatures so a fixed file is picked up on the next check
+                for part in updates:
+                    self._signatures.pop(part, None)
+                self._rejected = attempt
+                logger.error("Ignoring invalid catalog update in %s: %s", self.data_dir, exc)
+                return False
+
+            digests = dict(self._digests)
+            digests.update({part: digest for part, (digest, raw) in updates.items()})
+            version = catalog_version(digests)
+            self._catalog = Catalog.build(data, version, previous=self._catalog, changed=frozenset(updates))
+            self._data, self._digests = data, digests
+            logger.info("Loaded catalog version %s (changed: %s)", version, ", ".join(sorted(updates)))
+            unresolved = self._catalog.unresolved_references()
+            if unresolved:
+                logger.info("%d service references match no catalog service: %s",
+                            len(unresolved), ", ".join(unresolved))
+            return True
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_catalog_store() -> CatalogStore:
+    """Process-wide catalog store, created on first use"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CatalogStore()
+    return _store
+
+def get_catalog() -> Catalog:
+    """Current shared catalog; hold on to it for the duration of one analysis"""
+    return get_catalog_store().current()
@@ -0,0 +1,164 @@
+"""Score a batch of requirement profiles headlessly across a process pool.
+
+Reads one requirements profile per JSONL line or CSV row, runs the full
+analysis (scoring, patterns, cost, validation and business value) for each on
+worker processes and writes one result per profile as JSONL or Parquet.
+
+Profiles use the keys of ``engine.analyze``. In JSONL, ``capabilities`` is
+either a name -> bool object or a list of names; in CSV it is a ``;``-separated
+list of names. An optional ``id`` field names each result; otherwise the
+line/row number is used.
+
+Results are appended to the output (or, for Parquet, to a ``.checkpoint.jsonl``
+file next to it) as they finish, so an interrupted run resumes with the
+profiles that have no result yet. A profile that fails, including a line or
+row that cannot be parsed, is written with its error and not retried.
+
+Usage: python score_batch.py profiles.jsonl results.jsonl [--workers 4] [--chunksize 16]
+"""
+import argparse
+import csv
+import importlib.util
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+
+import engine
+
+# Requirement fields read from CSV cells as numbers
+NUMERIC_FIELDS = ("team_size", "expected_users", "data_volume_gb", "top_k", "min_score")
+PROGRESS_SECONDS = 5.0
+
+
+def _number(value):
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _csv_profile(row):
+    profile = {field: value for field, value in row.items() if value not in (None, "")}
+    for field in NUMERIC_FIELDS:
+        if field in profile:
+            profile[field] = _number(profile[field])
+    if "capabilities" in profile:
+        profile["capabilities"] = [cap.strip() for cap in profile["capabilities"].split(";") if cap.strip()]
+    return profile
+
+
+def read_profiles(path):
+    """Yield ``(id, profile, error)`` for every profile in a JSONL or CSV file.
+
+    A line or row that cannot be parsed comes with ``profile`` None and the
+    reason in ``error``, so it gets an error record instead of ending the batch.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows, parse = csv.DictReader(f), _csv_profile
+        else:
+            rows, parse = (line for line in f if line.strip()), json.loads
+        for number, row in enumerate(rows, start=1):
+            try:
+                profile = parse(row)
+                if not isinstance(profile, dict):
+                    raise ValueError("a profile must be a JSON object")
+            except ValueError as exc:
+                profile_id = row.get("id") if isinstance(row, dict) else None
+                yield str(profile_id or number), None, f"unreadable profile: {exc}"
+                continue
+            yield str(profile.pop("id", number)), profile, None
+
+
+def _init_worker():
+    # Load the shared catalog (from the snapshot when present) once per worker
+    engine.get_catalog()
+
+
+def analyze_profile(item):
+    profile_id, profile, error = item
+    if error is not None:
+        return {"id": profile_id, "error": error}
+    try:
+        result = engine.analyze(engine.validate_requirements(profile))
+        return {"id": profile_id, **result.to_dict()}
+    except Exception as exc:
+        return {"id": profile_id, "error": "".join(traceback.format_exception_only(type(exc), exc)).strip()}
+
+
+def completed_ids(checkpoint):
+    """IDs that already have a result in the checkpoint, dropping a torn last line"""
+    done = set()
+    if not os.path.exists(checkpoint):
+        return done
+    with open(checkpoint, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    for line in data.decode("utf-8").splitlines():
+        done.add(json.loads(line)["id"])
+    return done
+
+
+def check_parquet_support():
+    """Exit before any scoring if Parquet output could not be written at the end"""
+    if importlib.util.find_spec("pandas") is None or not (
+            importlib.util.find_spec("pyarrow") or importlib.util.find_spec("fastparquet")):
+        sys.exit("Parquet output needs pandas and pyarrow (or fastparquet); install them or write .jsonl instead")
+
+
+def write_parquet(checkpoint, output):
+    import pandas as pd
+
+    with open(checkpoint, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    # Nested analysis sections are stored as JSON text, so every row has the same flat schema
+    rows = [{field: value if field in ("id", "catalog_version", "requirements_key", "error") else json.dumps(value)
+             for field, value in record.items()} for record in records]
+    pd.DataFrame(rows).to_parquet(output, index=False)
+    os.remove(checkpoint)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="requirement profiles (.jsonl or .csv)")
+    parser.add_argument("output", help="results (.jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunksize", type=int, default=16, help="profiles sent to a worker at a time")
+    args = parser.parse_args()
+
+    parquet = args.output.endswith(".parquet")
+    if parquet:
+        check_parquet_support()
+    checkpoint = args.output + ".checkpoint.jsonl" if parquet else args.output
+    done = completed_ids(checkpoint)
+    pending = (item for item in read_profiles(args.input) if item[0] not in done)
+    if done:
+        print(f"Resuming: {len(done)} profiles already have results", file=sys.stderr)
+
+    engine.get_catalog()
+    started = last_report = time.perf_counter()
+    scored = failed = 0
+    with open(checkpoint, "a", encoding="utf-8") as out, \
+            multiprocessing.Pool(args.workers, initializer=_init_worker) as pool:
+        for record in pool.imap_unordered(analyze_profile, pending, chunksize=args.chunksize):
+            out.write(json.dumps(record) + "\n")
+            scored += 1
+            failed += "error" in record
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_SECONDS:
+                out.flush()
+                last_report = now
+                print(f"{scored} profiles, {scored / (now - started):.1f}/s", file=sys.stderr)
+
+    elapsed = time.perf_counter() - started
+    print(f"Scored {scored} profiles ({failed} failed) in {elapsed:.1f}s: "
+          f"{scored / elapsed if elapsed else 0:.1f} profiles/s with {args.workers} workers", file=sys.stderr)
+    if parquet:
+        write_parquet(checkpoint, args.output)
+
+
+if __name__ == "__main__":
+    main()
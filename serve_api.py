@@ -0,0 +1,133 @@
+"""Serve the recommendation engine as a local HTTP JSON API.
+
+Every POST endpoint takes requirements as its JSON body, with the keys of
+``engine.analyze``; ``capabilities`` may also be a list of names. Bodies that
+fail ``engine.validate_requirements`` get a 400 with the reason:
+
+    POST /analyze   ranked services and every analysis stage, including the diagram
+    POST /score     ranked services only
+    POST /cost      cost analysis of the recommended services
+    POST /diagram   Mermaid diagram of the recommended architecture
+    GET  /health    catalog version
+    GET  /stats     cache counters
+
+At most ``--concurrency`` analyses run at once per worker; further requests
+wait for a slot. Response bodies are cached per endpoint, catalog version and
+canonical requirements, and identical requests arriving while one is being
+computed share its result.
+
+Usage: python serve_api.py [--host 127.0.0.1] [--port 8600] [--concurrency 8] [--workers 1]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+from typing import Dict, Hashable
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+import engine
+
+# Analyses computed at once per worker process; set by --concurrency
+MAX_CONCURRENT_ANALYSES = int(os.environ.get("AZURE_DECIDER_API_CONCURRENCY", "8"))
+RESPONSE_CACHE_SIZE = 4096
+RESPONSE_CACHE_TTL_SECONDS = 300.0
+
+RENDERERS = {
+    "analyze": lambda result: result.to_dict(diagram=True),
+    "score": lambda result: {"catalog_version": result.catalog_version, "requirements_key": result.requirements_key,
+                             "services": result.ranked_services()},
+    "cost": lambda result: result.collect_stages(("cost_analysis",))["cost_analysis"],
+    "diagram": lambda result: {"diagram": result.collect_stages(("diagram",))["diagram"]}
+}
+
+response_cache = engine.ResultCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL_SECONDS)
+_analysis_slots = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+_in_flight: Dict[Hashable, asyncio.Future] = {}
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"error": message}, status_code=status)
+
+
+def _render(endpoint: str, requirements: Dict, catalog: engine.Catalog) -> bytes:
+    result = engine.analyze(requirements, catalog)
+    return json.dumps(RENDERERS[endpoint](result)).encode("utf-8")
+
+
+async def _compute(key: Hashable, endpoint: str, requirements: Dict, catalog: engine.Catalog) -> bytes:
+    async with _analysis_slots:
+        body = await run_in_threadpool(_render, endpoint, requirements, catalog)
+    response_cache.put(key, body)
+    return body
+
+
+async def handle_analysis(request: Request) -> Response:
+    endpoint = request.url.path.strip("/")
+    try:
+        body = await request.json()
+    except ValueError:
+        return _error(400, "request body must be JSON")
+    try:
+        requirements = engine.validate_requirements(body)
+    except ValueError as exc:
+        return _error(400, f"invalid requirements: {exc}")
+
+    catalog = engine.get_catalog()
+    key = (endpoint, catalog.version, engine.requirements_key(requirements))
+    body = response_cache.get(key)
+    if body is None:
+        task = _in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_compute(key, endpoint, requirements, catalog))
+            _in_flight[key] = task
+            task.add_done_callback(lambda _: _in_flight.pop(key, None))
+        # Shielded so a client disconnecting does not cancel a result others wait for
+        body = await asyncio.shield(task)
+    return Response(body, media_type="application/json")
+
+
+async def health(request: Request) -> Response:
+    return JSONResponse({"status": "ok", "catalog_version": engine.get_catalog().version})
+
+
+async def stats(request: Request) -> Response:
+    return JSONResponse({"responses": response_cache.stats(), "analyses": engine.result_cache.stats(),
+                         "scoring": engine.scoring_cache.stats(), "in_flight": len(_in_flight)})
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app: Starlette):
+    # Load the catalog before the first request instead of during it
+    engine.get_catalog()
+    yield
+
+
+app = Starlette(
+    routes=[Route(f"/{endpoint}", handle_analysis, methods=["POST"]) for endpoint in RENDERERS] + [
+        Route("/health", health), Route("/stats", stats)],
+    lifespan=lifespan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_ANALYSES,
+                        help="analyses computed at once per worker")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    args = parser.parse_args()
+
+    # Workers import this module afresh and read the limit from the environment
+    os.environ["AZURE_DECIDER_API_CONCURRENCY"] = str(args.concurrency)
+    uvicorn.run("serve_api:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import pytest
+
+import engine
+from engine import cache
+from engine.cache import ResultCache, scoring_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    results = ResultCache(maxsize=2)
+    results.put("a", 1)
+    results.put("b", 2)
+    assert results.get("a") == 1
+    results.put("c", 3)
+    assert results.get("b") is None
+    assert (results.get("a"), results.get("c")) == (1, 3)
+    assert results.stats() == {"size": 2, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    results = ResultCache(maxsize=8, ttl=60)
+    results.put("a", 1)
+    clock.now += 59
+    assert results.get("a") == 1
+    clock.now += 2
+    assert results.get("a") is None
+    assert len(results) == 0
+    assert results.stats()["evictions"] == 1
+
+
+def test_putting_an_entry_again_restarts_its_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    results = ResultCache(maxsize=8, ttl=60)
+    results.put("a", 1)
+    clock.now += 50
+    results.put("a", 2)
+    clock.now += 50
+    assert results.get("a") == 2
+
+
+@pytest.fixture(scope="module")
+def scoring_matrix():
+    return engine.get_catalog().scoring_matrix
+
+
+def key(scoring_matrix, **requirements):
+    base = {"use_case": "Real-time analytics with machine learning", "industry": "healthcare",
+            "capabilities": {"Real-time Analytics": True, "Machine Learning": True}}
+    return scoring_key(dict(base, **requirements), scoring_matrix)
+
+
+def test_scoring_key_ignores_what_scoring_does_not_read(scoring_matrix):
+    reference = key(scoring_matrix)
+    assert key(scoring_matrix, use_case="  REAL-TIME   analytics with Machine Learning ") == reference
+    assert key(scoring_matrix, capabilities={"Machine Learning": True, "Real-time Analytics": True,
+                                             "IoT": False}) == reference
+    assert key(scoring_matrix, team_size=80, expected_users=50000, data_volume_gb=9000) == reference
+
+
+def test_scoring_key_treats_unknown_industries_as_none(scoring_matrix):
+    assert key(scoring_matrix, industry="not-an-industry") == key(scoring_matrix, industry="")
+
+
+def test_scoring_key_changes_with_what_scoring_reads(scoring_matrix):
+    reference = key(scoring_matrix)
+    assert key(scoring_matrix, use_case="web hosting") != reference
+    assert key(scoring_matrix, industry="") != reference
+    assert key(scoring_matrix, capabilities={"Real-time Analytics": True}) != reference
+    assert key(scoring_matrix, top_k=5) != reference
+    assert key(scoring_matrix, min_score=25) != reference
+
+
+def test_equivalent_requirements_share_one_scoring_cache_entry():
+    catalog = engine.get_catalog()
+    engine.scoring_cache.clear()
+    first = engine.analyze({"use_case": "IoT telemetry with real-time analytics", "top_k": 7}, catalog)
+    second = engine.analyze({"use_case": "iot  TELEMETRY with real-time analytics", "top_k": 7,
+                             "team_size": 40}, catalog)
+    assert first is not second
+    assert second.reused == {"scoring"}
+    assert second.service_names == first.service_names
+    assert engine.scoring_cache.stats()["size"] == 1
+
+
+@pytest.mark.parametrize("limits", [{"min_score": "10"}, {"min_score": float("nan")}, {"min_score": None},
+                                    {"min_score": True}, {"top_k": 0}, {"top_k": 2.5}, {"top_k": True}])
+def test_invalid_ranking_limits_are_rejected_before_caching(limits):
+    engine.scoring_cache.clear()
+    with pytest.raises(ValueError):
+        engine.analyze(dict({"use_case": "analytics"}, **limits))
+    assert len(engine.scoring_cache) == 0
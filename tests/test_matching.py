@@ -0,0 +1,29 @@
+import pytest
+
+import engine
+from engine.matching import KeywordMatcher
+
+
+@pytest.fixture(scope="module")
+def index():
+    return engine.get_catalog().index
+
+
+@pytest.mark.parametrize("text", ["Delta Lake house for the finance team", "we felt the shelter",
+                                  "allmighty reports", "uk8s", "genairy"])
+def test_synonyms_do_not_fire_inside_other_words(index, text):
+    assert not index.matched_terms(text) & {"etl", "generative_ai", "kubernetes"}
+
+
+@pytest.mark.parametrize("text, term", [("ELT pipeline", "etl"), ("an LLM, please", "generative_ai"),
+                                        ("k8s cluster", "kubernetes"), ("(genai)", "generative_ai"),
+                                        ("near real-time dashboards", "real_time"), ("on-premises", "hybrid_cloud")])
+def test_synonyms_and_variants_match_whole_words(index, text, term):
+    assert term in index.matched_terms(text)
+
+
+def test_literal_keywords_keep_substring_matching():
+    matcher = KeywordMatcher({"etl": "etl", "elt": "etl"}, whole_words=["elt"])
+    assert matcher.matched_terms("etlpipeline") == {"etl"}
+    assert matcher.matched_terms("delta") == set()
+    assert [(hit.start, hit.end) for hit in matcher.scan("ELT / etl")] == [(0, 3), (6, 9)]
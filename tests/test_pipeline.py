@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+import engine
+from engine import pipeline
+
+REQUIREMENTS = {"use_case": "real-time analytics with machine learning", "industry": "healthcare",
+                "capabilities": {"Real-time Analytics": True}, "team_size": 10, "expected_users": 1000,
+                "data_volume_gb": 500}
+
+
+def test_failed_stage_is_not_stored_on_the_shared_result(monkeypatch):
+    calls = []
+    original = pipeline.generate_cost_analysis
+
+    def flaky_cost_analysis(services, requirements):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("pricing unavailable")
+        return original(services, requirements)
+
+    monkeypatch.setattr(pipeline, "generate_cost_analysis", flaky_cost_analysis)
+    result = engine.analyze(REQUIREMENTS, use_cache=False)
+
+    [(stage, value, error)] = result.stages(("cost_analysis",))
+    assert stage == "cost_analysis" and value is None and isinstance(error, RuntimeError)
+    assert "cost_analysis" not in result.computed_stages
+    # The next caller of the same result computes the stage again instead of seeing the failure
+    assert result.cost_analysis["total_monthly"] > 0
+    assert len(calls) == 2
+
+
+def test_to_dict_computes_its_sections_on_the_stage_workers(monkeypatch):
+    threads = {}
+    for name in ("detect_architecture_patterns", "generate_cost_analysis", "validate_architecture_completeness",
+                 "calculate_business_value"):
+        original = getattr(pipeline, name)
+
+        def recording(*args, _name=name, _original=original):
+            threads[_name] = threading.current_thread().name
+            return _original(*args)
+
+        monkeypatch.setattr(pipeline, name, recording)
+    result = engine.analyze(REQUIREMENTS, use_cache=False)
+
+    sections = result.to_dict(diagram=True)
+    assert set(sections) >= {"patterns", "cost_analysis", "critical_gaps", "business_value", "diagram"}
+    assert len(threads) == 4
+    assert all(name.startswith("analysis-stage") for name in threads.values())
+
+
+def test_to_dict_raises_when_a_stage_times_out(monkeypatch):
+    release = threading.Event()
+    original = pipeline.calculate_business_value
+
+    def hung_business_value(services, requirements):
+        release.wait(5)
+        return original(services, requirements)
+
+    monkeypatch.setattr(pipeline, "calculate_business_value", hung_business_value)
+    result = engine.analyze(REQUIREMENTS, use_cache=False)
+    try:
+        with pytest.raises(TimeoutError):
+            result.collect_stages(timeout=0.2)
+    finally:
+        release.set()
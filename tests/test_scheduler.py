@@ -0,0 +1,64 @@
+import threading
+import time
+
+from engine.scheduler import STAGE_WORKERS, StageSkipped, _get_executor, run_stage_graph
+
+
+def outcomes(dependencies, compute, timeout):
+    return {stage: (value, error) for stage, value, error in run_stage_graph(dependencies, compute, timeout)}
+
+
+def test_stages_run_after_their_dependencies():
+    order = []
+
+    def compute(stage):
+        order.append(stage)
+        return stage.upper()
+
+    results = outcomes({"patterns": (), "cost": (), "diagram": ("patterns",)}, compute, timeout=5)
+    assert results == {"patterns": ("PATTERNS", None), "cost": ("COST", None), "diagram": ("DIAGRAM", None)}
+    assert order.index("patterns") < order.index("diagram")
+
+
+def test_failing_stage_skips_only_its_dependants():
+    def compute(stage):
+        if stage == "patterns":
+            raise ValueError("no patterns")
+        return stage
+
+    results = outcomes({"patterns": (), "cost": (), "diagram": ("patterns",)}, compute, timeout=5)
+    assert isinstance(results["patterns"][1], ValueError)
+    assert isinstance(results["diagram"][1], StageSkipped)
+    assert results["cost"] == ("cost", None)
+
+
+def test_slow_stage_times_out_without_affecting_others():
+    release = threading.Event()
+
+    def compute(stage):
+        if stage == "patterns":
+            release.wait(5)
+        return stage
+
+    try:
+        started = time.monotonic()
+        results = outcomes({"patterns": (), "cost": (), "diagram": ("patterns",)}, compute, timeout=0.2)
+        assert time.monotonic() - started < 2
+    finally:
+        release.set()
+    assert isinstance(results["patterns"][1], TimeoutError)
+    assert isinstance(results["diagram"][1], StageSkipped)
+    assert results["cost"] == ("cost", None)
+
+
+def test_time_queued_on_a_saturated_pool_does_not_count_against_the_timeout():
+    release = threading.Event()
+    for _ in range(STAGE_WORKERS):
+        _get_executor().submit(release.wait, 5)
+    threading.Timer(0.5, release.set).start()
+
+    started = time.monotonic()
+    results = outcomes({"patterns": (), "cost": (), "diagram": ("patterns",)}, lambda stage: stage, timeout=0.2)
+    # The stages waited in the queue for longer than their timeout before they ran
+    assert time.monotonic() - started >= 0.4
+    assert results == {stage: (stage, None) for stage in ("patterns", "cost", "diagram")}
@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import score_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_unparseable_csv_cells_give_an_error_record_for_that_row(tmp_path):
+    path = write(tmp_path / "profiles.csv", "id,use_case,capabilities,team_size\n"
+                                            "a,web apps,APIs;Serverless,12\n"
+                                            "b,analytics,,abc\n"
+                                            ",iot,,3\n")
+    profiles = list(score_batch.read_profiles(path))
+    assert profiles[0] == ("a", {"use_case": "web apps", "capabilities": ["APIs", "Serverless"], "team_size": 12}, None)
+    assert profiles[1][:2] == ("b", None) and "abc" in profiles[1][2]
+    assert profiles[2] == ("3", {"use_case": "iot", "team_size": 3}, None)
+
+
+def test_malformed_jsonl_lines_give_an_error_record(tmp_path):
+    path = write(tmp_path / "profiles.jsonl", '{"id": "a", "use_case": "web apps"}\n'
+                                              '{"use_case": \n'
+                                              '\n'
+                                              '["not", "an", "object"]\n')
+    profiles = list(score_batch.read_profiles(path))
+    assert profiles[0] == ("a", {"use_case": "web apps"}, None)
+    assert [(profile_id, profile) for profile_id, profile, _ in profiles[1:]] == [("2", None), ("3", None)]
+    assert all(error.startswith("unreadable profile") for _, _, error in profiles[1:])
+    assert score_batch.analyze_profile(profiles[1]) == {"id": "2", "error": profiles[1][2]}
+
+
+def test_failing_profile_is_recorded_with_its_error():
+    record = score_batch.analyze_profile(("x", {"use_case": "analytics", "top_k": 0}, None))
+    assert record["id"] == "x" and "top_k" in record["error"]
+
+
+def run_batch(*args):
+    return subprocess.run([sys.executable, os.path.join(ROOT, "score_batch.py"), *args, "--workers", "1"],
+                          capture_output=True, text=True, cwd=ROOT, timeout=120)
+
+
+def test_batch_with_bad_rows_finishes_and_resumes(tmp_path):
+    profiles = write(tmp_path / "profiles.csv", "id,use_case,team_size\n"
+                                                "good,real-time analytics,10\n"
+                                                "bad,analytics,abc\n")
+    output = str(tmp_path / "results.jsonl")
+    assert run_batch(profiles, output).returncode == 0
+    with open(output, encoding="utf-8") as f:
+        records = {record["id"]: record for record in map(json.loads, f)}
+    assert "error" in records["bad"] and "error" not in records["good"]
+    assert records["good"]["services"]
+
+    rerun = run_batch(profiles, output)
+    assert rerun.returncode == 0 and "2 profiles already have results" in rerun.stderr
+    with open(output, encoding="utf-8") as f:
+        assert len(f.readlines()) == 2
+
+
+def test_missing_parquet_engine_exits_before_scoring(monkeypatch):
+    real_find_spec = score_batch.importlib.util.find_spec
+    monkeypatch.setattr(score_batch.importlib.util, "find_spec",
+                        lambda name: None if name in ("pyarrow", "fastparquet") else real_find_spec(name))
+    with pytest.raises(SystemExit, match="pyarrow"):
+        score_batch.check_parquet_support()
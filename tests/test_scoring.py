@@ -0,0 +1,90 @@
+import random
+
+import numpy as np
+import pytest
+
+import engine
+from engine.scoring import ScoringMatrix
+
+WORDS = ["analytics", "machine learning", "etl", "web", "iot", "security", "api", "real-time", "storage",
+         "data warehouse", "chatbot", "containers", "serverless", "compliance", "monitoring"]
+CAPABILITIES = [cap for caps in engine.CAPABILITY_CATEGORIES.values() for cap in caps]
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return engine.get_catalog()
+
+
+def random_requirements(rng, industries):
+    return {"use_case": " ".join(rng.sample(WORDS, rng.randint(1, 4))),
+            "industry": rng.choice([""] + industries),
+            "capabilities": {cap: rng.random() < 0.2 for cap in CAPABILITIES}}
+
+
+def ranked(matrix, state, threshold, limit):
+    state, _ = matrix.iterate_synergy(state, threshold=threshold, limit=limit)
+    scored = matrix.rank_state(state, threshold=threshold, limit=limit)
+    return scored.service_ids.tolist(), scored.totals.tolist(), scored.breakdowns.tolist()
+
+
+@pytest.mark.parametrize("fractions", [(0,), (0.25, 0.5, 0.75)], ids=["int", "float"])
+def test_pruned_synergy_rounds_match_unpruned_ones(catalog, monkeypatch, fractions):
+    matrix = catalog.scoring_matrix
+    rng = random.Random(21)
+    cases = [(random_requirements(rng, list(catalog.industries)), rng.randint(10, 35) + rng.choice(fractions),
+              rng.choice([3, 5, 10, 20])) for _ in range(2000)]
+    states = [matrix.score_state(requirements, {"selected_services": []}) for requirements, _, _ in cases]
+    pruned = [ranked(matrix, state, threshold, limit) for state, (_, threshold, limit) in zip(states, cases)]
+
+    monkeypatch.setattr(ScoringMatrix, "_synergy_candidates",
+                        lambda self, base_totals, threshold, limit: np.arange(self.size))
+    unpruned = [ranked(matrix, state, threshold, limit) for state, (_, threshold, limit) in zip(states, cases)]
+    assert pruned == unpruned
+
+
+def reference_scores(catalog, requirements, context):
+    return [engine.calculate_comprehensive_score(service, requirements, context, catalog.index, catalog.industries)
+            for service in catalog.services]
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matrix_scores_match_the_reference_scorer_component_by_component(catalog, seed):
+    rng = random.Random(seed)
+    service_names = [service.name for service in catalog.services]
+    for _ in range(50):
+        requirements = random_requirements(rng, list(catalog.industries))
+        context = {"selected_services": rng.sample(service_names, rng.randint(0, 12))}
+        totals, breakdowns = catalog.scoring_matrix.score(requirements, context)
+        for service, (total, breakdown) in zip(catalog.services, reference_scores(catalog, requirements, context)):
+            assert totals[service.id] == total, service.name
+            assert dict(zip(engine.SCORE_COMPONENTS, breakdowns[service.id].tolist())) == breakdown, service.name
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_capability_deltas_match_a_fresh_score(catalog, seed):
+    matrix = catalog.scoring_matrix
+    rng = random.Random(seed)
+    context = {"selected_services": []}
+    for _ in range(50):
+        requirements = random_requirements(rng, list(catalog.industries))
+        state = matrix.score_state(requirements, context)
+        for _ in range(3):
+            requirements = dict(requirements, capabilities={cap: rng.random() < 0.2 for cap in CAPABILITIES})
+            state = matrix.rescore_capabilities(state, requirements["capabilities"])
+            fresh = matrix.score_state(requirements, context)
+            assert (state.totals == fresh.totals).all()
+            assert (state.breakdown() == fresh.breakdown()).all()
+
+
+def test_resolver_maps_names_and_aliases_to_catalog_ids(catalog):
+    resolver = catalog.index.resolver
+    synapse = next(service.id for service in catalog.services if service.name == "Azure Synapse Analytics")
+    assert resolver.resolve("Azure Synapse Analytics") == synapse
+    assert resolver.resolve("  azure   SYNAPSE analytics ") == synapse
+    assert resolver.resolve("Synapse") == synapse
+    assert resolver.resolve("Office 365") is None
+    assert resolver.resolve_all(["Synapse", "Office 365", "Azure Synapse", "AKS"]) == (
+        synapse, resolver.resolve("Azure Kubernetes Service (AKS)"))
+    for service in catalog.services:
+        assert resolver.resolve(service.name) == service.id
@@ -0,0 +1,75 @@
+import asyncio
+import json
+
+import pytest
+
+import engine
+import serve_api
+
+
+def post(path, body):
+    """Send one POST through the ASGI app and return (status, decoded JSON body)"""
+    payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+             "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+             "headers": [(b"content-type", b"application/json")], "server": ("testserver", 80),
+             "client": ("testclient", 5000)}
+    asyncio.run(serve_api.app(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    return status, json.loads(b"".join(message.get("body", b"") for message in sent
+                                       if message["type"] == "http.response.body"))
+
+
+@pytest.mark.parametrize("body, field", [
+    (b"not json", "JSON"),
+    (["Web Hosting"], "object"),
+    ({"capabilities": "Web Hosting"}, "capabilities"),
+    ({"capabilities": [1, 2]}, "capabilities"),
+    ({"capabilities": {"APIs": "yes"}}, "capabilities"),
+    ({"use_case": 42}, "use_case"),
+    ({"industry": ["retail"]}, "industry"),
+    ({"team_size": "ten"}, "team_size"),
+    ({"expected_users": -5}, "expected_users"),
+    ({"data_volume_gb": True}, "data_volume_gb"),
+    ({"top_k": "5"}, "top_k"),
+    ({"top_k": 0}, "top_k"),
+    ({"min_score": "high"}, "min_score"),
+])
+def test_invalid_bodies_get_400_with_the_reason(body, field):
+    status, response = post("/score", body)
+    assert status == 400
+    assert field in response["error"]
+
+
+def test_capabilities_may_be_a_list_of_names():
+    status, listed = post("/score", {"use_case": "web apps", "capabilities": ["APIs", "Serverless"]})
+    assert status == 200
+    status, mapped = post("/score", {"use_case": "web apps", "capabilities": {"APIs": True, "Serverless": True}})
+    assert status == 200
+    assert listed == mapped
+    assert listed["requirements_key"] == engine.requirements_key(
+        {"use_case": "web apps", "capabilities": {"Serverless": True, "APIs": True}})
+
+
+def test_validate_requirements_fills_no_defaults_and_keeps_the_input():
+    raw = {"use_case": "iot", "capabilities": ["IoT"], "top_k": 5}
+    assert engine.validate_requirements(raw) == {"use_case": "iot", "capabilities": {"IoT": True}, "top_k": 5}
+    assert raw["capabilities"] == ["IoT"]
+
+
+def test_unknown_capability_names_do_not_grow_the_shared_catalog():
+    matrix = engine.get_catalog().scoring_matrix
+    columns = len(matrix._capability_columns)
+    for number in range(50):
+        status, _ = post("/score", {"use_case": "web apps", "capabilities": [f"Made Up Capability {number}"]})
+        assert status == 200
+    assert len(matrix._capability_columns) == columns
@@ -0,0 +1,33 @@
+import pytest
+
+import engine
+
+
+@pytest.fixture(scope="module")
+def snapshot_bytes(tmp_path_factory):
+    path = tmp_path_factory.mktemp("snapshot") / "catalog.snapshot"
+    engine.CatalogStore(engine.CATALOG_DATA_DIR, snapshot_path="").snapshot(path)
+    return path.read_bytes()
+
+
+def test_snapshot_round_trip(tmp_path, snapshot_bytes):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(snapshot_bytes)
+    store = engine.CatalogStore(engine.CATALOG_DATA_DIR, snapshot_path=str(path))
+    assert store.current().version == engine.get_catalog().version
+
+
+@pytest.mark.parametrize("fraction", [0.0, 0.001, 0.0015, 0.01, 0.5, 0.9, 0.999])
+def test_truncated_snapshot_falls_back_to_the_data_files(tmp_path, snapshot_bytes, fraction):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(snapshot_bytes[:int(len(snapshot_bytes) * fraction)])
+    store = engine.CatalogStore(engine.CATALOG_DATA_DIR, snapshot_path=str(path))
+    assert store.current().version == engine.get_catalog().version
+
+
+@pytest.mark.parametrize("length", [1, 8, 12, 15, 16, 40])
+def test_snapshot_shorter_than_its_header_falls_back_to_the_data_files(tmp_path, snapshot_bytes, length):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(snapshot_bytes[:length])
+    store = engine.CatalogStore(engine.CATALOG_DATA_DIR, snapshot_path=str(path))
+    assert store.current().version == engine.get_catalog().version